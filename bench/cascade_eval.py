@@ -0,0 +1,87 @@
+"""
+분류 cascade 임계값별 정확도 / 지연 시간 비교
+
+QuickDraw 검증 샘플(ImageFolder 구조: <dir>/<클래스 폴더>/<이미지>, 폴더 이름 = config.DEMO_CATEGORIES 의 클래스 이름)에 대해
+작은 CNN 과 EfficientNet 을 각각 이미지 한 장씩 실행하여 정답 여부와 소요 시간을 기록한 뒤,
+임계값마다 cascade 의 top-1 정확도, EfficientNet 으로 넘어간 비율, 이미지당 예상 지연 시간을 계산합니다.
+
+    python -m bench.cascade_eval <검증 샘플 디렉토리> [--thresholds 50 70 80 90 95] [--per-class 20]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+import config
+from src.image import classifier
+
+
+def load_samples(sample_dir: str, per_class: int):
+    classes = sorted(d for d in os.listdir(sample_dir) if os.path.isdir(os.path.join(sample_dir, d)))
+    samples = []
+    for name in classes:
+        # 모델의 클래스 index 는 폴더 정렬 순서가 아니라 config.DEMO_CATEGORIES 순서를 따름
+        if name not in config.DEMO_CATEGORIES:
+            print(f"경고: 학습 클래스에 없는 폴더를 건너뜁니다: {name}")
+            continue
+        label = config.DEMO_CATEGORIES.index(name)
+        folder = os.path.join(sample_dir, name)
+        files = sorted(f for f in os.listdir(folder) if f.lower().endswith(('.png', '.jpg', '.jpeg')))
+        samples += [(os.path.join(folder, f), label) for f in files[:per_class]]
+    if not samples:
+        raise SystemExit(f"샘플 이미지가 없습니다: {sample_dir}")
+    return samples
+
+
+def timed(fn, crops):
+    start = time.perf_counter()
+    probabilities = fn(crops)
+    return probabilities[0], time.perf_counter() - start
+
+
+def run(sample_dir: str, thresholds, per_class: int):
+    samples = load_samples(sample_dir, per_class)
+
+    # warm-up (모델 로드 포함)
+    crops = classifier.resize_crop(classifier.to_uint8_tensor(Image.open(samples[0][0]))).unsqueeze(0)
+    classifier.tiny_probabilities(crops)
+    classifier.efficientnet_probabilities(crops)
+
+    labels, tiny_conf, tiny_pred, full_pred = [], [], [], []
+    tiny_times, full_times = [], []
+    for path, label in samples:
+        crops = classifier.resize_crop(classifier.to_uint8_tensor(Image.open(path))).unsqueeze(0)
+        tiny, tiny_time = timed(classifier.tiny_probabilities, crops)
+        full, full_time = timed(classifier.efficientnet_probabilities, crops)
+        labels.append(label)
+        tiny_conf.append(tiny.max().item() * 100)
+        tiny_pred.append(tiny.argmax().item())
+        full_pred.append(full.argmax().item())
+        tiny_times.append(tiny_time)
+        full_times.append(full_time)
+
+    labels, tiny_conf = np.array(labels), np.array(tiny_conf)
+    tiny_correct = np.array(tiny_pred) == labels
+    full_correct = np.array(full_pred) == labels
+    tiny_ms, full_ms = np.mean(tiny_times) * 1000, np.mean(full_times) * 1000
+
+    print(f"samples: {len(samples)}, tiny {tiny_ms:.2f} ms/img, efficientnet {full_ms:.2f} ms/img")
+    print(f"{'threshold':>10}{'accuracy':>10}{'tiny hit':>10}{'ms/img':>10}")
+    print(f"{'tiny only':>10}{tiny_correct.mean():>10.3f}{1.0:>10.3f}{tiny_ms:>10.2f}")
+    for threshold in thresholds:
+        accepted = tiny_conf >= threshold
+        correct = np.where(accepted, tiny_correct, full_correct)
+        latency = tiny_ms + (1 - accepted.mean()) * full_ms
+        print(f"{threshold:>10.1f}{correct.mean():>10.3f}{accepted.mean():>10.3f}{latency:>10.2f}")
+    print(f"{'full only':>10}{full_correct.mean():>10.3f}{0.0:>10.3f}{full_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('sample_dir')
+    parser.add_argument('--thresholds', nargs='+', type=float, default=[50, 70, 80, 90, 95, 99])
+    parser.add_argument('--per-class', type=int, default=20)
+    args = parser.parse_args()
+    run(args.sample_dir, args.thresholds, args.per_class)
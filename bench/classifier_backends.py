@@ -0,0 +1,72 @@
+"""
+분류 모델 추론 backend 비교
+
+MODEL_PATH 의 최신 체크포인트로 각 backend 를 만들고, eager 대비 top-3 일치율과
+배치 크기별 처리량(images/s), p50 / p99 지연 시간을 비교합니다.
+CLASSIFIER_CALIBRATION_DIR 를 지정하면 샘플 이미지로 일치율을 검사합니다.
+
+    python -m bench.classifier_backends [--backends eager torchscript int8_dynamic] [--batch-sizes 1 8] [--iters 50] [--threads 4]
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+import config
+from src.image import classifier
+from src.image.classifier_backends import BACKENDS, build_backend, set_threads, top3_parity
+
+
+def measure(backend, batch: torch.Tensor, iters: int):
+    with torch.no_grad():
+        for _ in range(3):
+            backend(batch)
+        latencies = []
+        for _ in range(iters):
+            start = time.perf_counter()
+            backend(batch)
+            latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    return {
+        "throughput": len(batch) / latencies.mean(),
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p99_ms": np.percentile(latencies, 99) * 1000,
+    }
+
+
+def run(backends, batch_sizes, iters: int, threads: int):
+    set_threads(threads)
+    print(f"torch threads: {torch.get_num_threads()}")
+
+    model = classifier.load_efficientnet_model(classifier.latest_checkpoint(), len(config.DEMO_CATEGORIES), fallback=False)
+    model.eval()
+    inputs, real_samples = classifier.calibration_batch()
+    if not real_samples:
+        print("경고: CLASSIFIER_CALIBRATION_DIR 가 없어 합성 스케치로 일치율을 검사합니다 (int8_static 결과는 신뢰할 수 없음)")
+
+    print(f"{'backend':<14}{'top1':>7}{'top3':>7}{'batch':>7}{'img/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind in backends:
+        try:
+            backend = build_backend(kind, model, inputs)
+            parity = top3_parity(model, backend, inputs)
+        except Exception as e:
+            print(f"{kind:<14} 생성 실패: {e}")
+            continue
+        for batch_size in batch_sizes:
+            batch = inputs[:batch_size].repeat((batch_size + len(inputs) - 1) // len(inputs), 1, 1, 1)[:batch_size]
+            result = measure(backend, batch, iters)
+            print(
+                f"{kind:<14}{parity['top1']:>7.3f}{parity['top3']:>7.3f}{batch_size:>7}"
+                f"{result['throughput']:>10.1f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 8, config.CLASSIFY_MAX_BATCH_SIZE])
+    parser.add_argument('--iters', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=config.CLASSIFIER_INTRA_OP_THREADS)
+    args = parser.parse_args()
+    run(args.backends, args.batch_sizes, args.iters, args.threads)
@@ -0,0 +1,80 @@
+"""
+OCR 마스킹 모드 비교 벤치마크 ('recognize' vs 'detect')
+
+샘플 스케치마다 두 모드의 마스킹 결과(마스킹 영역 IoU)와 소요 시간을 비교합니다.
+
+    python -m bench.ocr_modes <샘플 이미지 디렉토리> [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.image import text_masking
+
+MODES = ('recognize', 'detect')
+
+
+def masked_region(original: Image.Image, masked: Image.Image) -> np.ndarray:
+    """마스킹으로 바뀐 픽셀 (H, W) bool"""
+    return np.any(np.asarray(original) != np.asarray(masked), axis=2)
+
+
+def iou(a: np.ndarray, b: np.ndarray) -> float:
+    union = np.logical_or(a, b).sum()
+    if union == 0:
+        return 1.0
+    return float(np.logical_and(a, b).sum() / union)
+
+
+def run(sample_dir: str, repeat: int):
+    paths = sorted(
+        p for p in glob.glob(os.path.join(sample_dir, '*'))
+        if p.lower().endswith(('.png', '.jpg', '.jpeg'))
+    )
+    if not paths:
+        raise SystemExit(f"샘플 이미지가 없습니다: {sample_dir}")
+
+    # 모델 로드 및 warm-up 은 측정에서 제외
+    warmup = Image.open(paths[0]).convert('RGB')
+    for mode in MODES:
+        text_masking.paint_boxes(warmup, text_masking.find_text_boxes(warmup, mode))
+
+    timings = {mode: [] for mode in MODES}
+    print(f"{'file':<30} {'boxes(rec)':>10} {'boxes(det)':>10} {'ms(rec)':>9} {'ms(det)':>9} {'mask IoU':>9}")
+    for path in paths:
+        image = Image.open(path).convert('RGB')
+        regions = {}
+        counts = {}
+        elapsed = {}
+        for mode in MODES:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                boxes = text_masking.find_text_boxes(image, mode)
+                masked = text_masking.paint_boxes(image, boxes)
+                times.append(time.perf_counter() - start)
+            elapsed[mode] = min(times) * 1000
+            timings[mode].append(elapsed[mode])
+            counts[mode] = len(boxes)
+            regions[mode] = masked_region(image, masked)
+
+        print(f"{os.path.basename(path)[:30]:<30} {counts['recognize']:>10} {counts['detect']:>10} "
+              f"{elapsed['recognize']:>9.1f} {elapsed['detect']:>9.1f} "
+              f"{iou(regions['recognize'], regions['detect']):>9.3f}")
+
+    print()
+    for mode in MODES:
+        ms = np.array(timings[mode])
+        print(f"{mode:<10} p50 {np.percentile(ms, 50):8.1f} ms   p95 {np.percentile(ms, 95):8.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sample_dir', help="샘플 스케치 이미지 디렉토리")
+    parser.add_argument('--repeat', type=int, default=3, help="이미지별 반복 측정 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+    run(args.sample_dir, args.repeat)
@@ -0,0 +1,63 @@
+"""
+OCR 해상도별 마스킹 품질 비교
+
+원본 해상도에서 검출한 마스크를 기준으로, OCR 입력을 여러 최대 변 길이로 축소했을 때의
+마스킹 영역 IoU 와 소요 시간을 비교합니다.
+
+    python -m bench.ocr_scale <샘플 이미지 디렉토리> [--sides 1280 1024 768 512] [--mode detect]
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+import config
+from src.image import text_masking
+from bench.ocr_modes import iou, masked_region
+
+
+def run(sample_dir: str, sides, mode: str):
+    paths = sorted(
+        p for p in glob.glob(os.path.join(sample_dir, '*'))
+        if p.lower().endswith(('.png', '.jpg', '.jpeg'))
+    )
+    if not paths:
+        raise SystemExit(f"샘플 이미지가 없습니다: {sample_dir}")
+
+    warmup = Image.open(paths[0]).convert('RGB')
+    text_masking.find_text_boxes(warmup, mode, max_side=0)
+
+    scales = [0] + list(sides)  # 0: 원본 해상도 (기준)
+    ious = {side: [] for side in sides}
+    timings = {side: [] for side in scales}
+    for path in paths:
+        image = Image.open(path).convert('RGB')
+        regions = {}
+        for side in scales:
+            start = time.perf_counter()
+            masked = text_masking.paint_boxes(image, text_masking.find_text_boxes(image, mode, max_side=side))
+            timings[side].append((time.perf_counter() - start) * 1000)
+            regions[side] = masked_region(image, masked)
+        for side in sides:
+            ious[side].append(iou(regions[0], regions[side]))
+
+    print(f"mode={mode}, samples={len(paths)}")
+    print(f"{'max_side':>9} {'p50 ms':>9} {'p95 ms':>9} {'mean IoU':>9} {'min IoU':>9}")
+    for side in scales:
+        ms = np.array(timings[side])
+        label = 'original' if side == 0 else str(side)
+        mean_iou = np.mean(ious[side]) if side else 1.0
+        min_iou = np.min(ious[side]) if side else 1.0
+        print(f"{label:>9} {np.percentile(ms, 50):9.1f} {np.percentile(ms, 95):9.1f} {mean_iou:9.3f} {min_iou:9.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sample_dir', help="샘플 스케치 이미지 디렉토리")
+    parser.add_argument('--sides', type=int, nargs='+', default=[1280, 1024, 768, 512], help="비교할 OCR 최대 변 길이")
+    parser.add_argument('--mode', default=config.OCR_MODE, choices=['recognize', 'detect'])
+    args = parser.parse_args()
+    run(args.sample_dir, args.sides, args.mode)
@@ -1,3 +1,4 @@
+import os
 
 TEXT_THRESHOLD=0.7
 
@@ -296,4 +297,147 @@ DEMO_CATEGORIES=[
 ]
 
 
-MODEL_PATH= 'src/image/trained_model/'
\ No newline at end of file
+MODEL_PATH= 'src/image/trained_model/'
+
+# 이미지 다운로드(S3) 설정
+FETCH_TIMEOUT = 10.0  # 요청 전체 제한 시간(초)
+FETCH_CONNECT_TIMEOUT = 3.0  # 연결 제한 시간(초)
+FETCH_MAX_BYTES = 10 * 1024 * 1024  # 다운로드 최대 크기 (10MB)
+FETCH_MAX_CONNECTIONS = 100  # 전체 커넥션 풀 크기
+FETCH_MAX_CONNECTIONS_PER_HOST = 20  # 호스트별 최대 커넥션 수
+FETCH_KEEPALIVE_TIMEOUT = 30.0  # keep-alive 유지 시간(초)
+
+# 추론 실행기 설정
+INFERENCE_EXECUTOR = 'thread'  # 'thread' | 'process' ('process' 이면 /metrics 의 cascade / caption_encoder_cache / text_gate 지표는 null)
+INFERENCE_MAX_WORKERS = 4
+INFERENCE_STAGE_CONCURRENCY = {  # 단계별 동시 실행 수
+    'mask': 2,
+    'classify': 2,
+    'caption': 1,
+}
+INFERENCE_MAX_QUEUE = 32  # 단계별 최대 대기 요청 수 (초과 시 503)
+
+# 분류기 마이크로 배칭 설정
+CLASSIFY_MAX_BATCH_SIZE = 16  # 한 번의 forward 에 묶을 최대 요청 수
+CLASSIFY_MAX_WAIT_MS = 5.0  # 배치를 모으기 위해 기다리는 최대 시간(ms)
+CLASSIFY_MAX_QUEUE = 256  # 배치를 기다리는 최대 요청 수 (초과 시 503)
+
+# 이미지 결과 캐시 설정 (이미지 내용 해시 기준)
+RESULT_CACHE_MAX_ENTRIES = 1024
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 캐시 전체 최대 크기 (256MB)
+RESULT_CACHE_TTL = 600  # 캐시 유지 시간(초)
+
+# OCR 사전 검사(텍스트 존재 여부) 설정
+TEXT_GATE_ENABLED = True  # False 면 항상 OCR 실행
+TEXT_GATE_MAX_SIDE = 512  # 검사용으로 축소할 최대 변 길이(px)
+TEXT_GATE_MIN_GLYPHS = 3  # 글자처럼 나란히 놓인 연결 요소가 이 개수 미만이면 OCR 생략
+
+# OCR 마스킹 모드
+# 'recognize': 검출 + 인식(readtext) 후 인식 신뢰도(TEXT_THRESHOLD)로 필터링
+# 'detect': 검출기(CRAFT) 영역만 사용, 인식 모델을 로드/실행하지 않음
+OCR_MODE = 'recognize'
+OCR_DETECT_THRESHOLD = 0.7  # 'detect' 모드의 검출 점수 임계값
+OCR_MAX_SIDE = 1024  # OCR 입력 이미지의 최대 변 길이(px), 0 이면 원본 해상도 사용
+
+# OpenAI(LLM) 클라이언트 설정
+LLM_BASE_URL = None  # None 이면 OPENAI_BASE_URL 환경변수 또는 OpenAI 기본 주소 사용
+LLM_TIMEOUT = 15.0  # 호출별 기본 제한 시간(초)
+LLM_CONNECT_TIMEOUT = 3.0
+LLM_MAX_RETRIES = 1
+LLM_MAX_CONNECTIONS = 100  # 공유 커넥션 풀 크기
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_MAX_CONCURRENCY = 64  # 프로세스 전체 동시 LLM 호출 수
+
+# 묘묘 대화 기록 설정
+MYOMYO_HISTORY_TOKEN_BUDGET = 1500  # 게임별 프롬프트 토큰 예산 (system prompt 포함)
+MYOMYO_HISTORY_KEEP_RECENT = 6  # 예산과 관계없이 그대로 유지할 최근 메시지 수
+MYOMYO_HISTORY_POLICY = 'summarize'  # 오래된 메시지 처리: 'summarize'(요약 줄로 압축) | 'drop'(삭제)
+MYOMYO_HISTORY_SUMMARY_TOKENS = 300  # 요약의 최대 토큰 수
+
+# 게임 상태 정리 설정 (묘묘 대화 기록 / 루루 과제)
+GAME_IDLE_TTL = 3600  # 마지막 접근 후 이 시간(초)이 지나면 게임 상태 삭제
+GAME_MAX_LIVE = 10000  # 캐릭터별 최대 게임 수 (초과 시 가장 오래 사용되지 않은 게임 삭제)
+GAME_SWEEP_INTERVAL = 60  # 만료 게임 정리 주기(초)
+
+# 루루 그림 과제 사전 생성 풀 설정
+LULU_TASK_POOL_SIZE = 10  # 미리 만들어 둘 과제 수
+LULU_TASK_POOL_LOW_WATER = 4  # 남은 과제가 이 수 미만이면 백그라운드에서 다시 채움
+LULU_TASK_POOL_REFILL_CONCURRENCY = 2  # 채울 때 동시에 실행할 LLM 호출 수
+
+# 묘묘 정형 이벤트 대사 뱅크 설정 (게임/라운드 시작·종료)
+MYOMYO_LINE_BANK_ENABLED = True
+MYOMYO_LINE_BANK_PATH = None  # 미리 생성한 대사 파일(JSON) 경로, None 이면 백그라운드 생성만 사용
+MYOMYO_LINE_BANK_VARIANTS = 8  # 이벤트/파라미터 조합별로 생성할 대사 수
+MYOMYO_LINE_BANK_LIVE_RATIO = 0.2  # 대사가 있어도 이 비율만큼은 실시간 생성 (뻔한 말투 방지)
+MYOMYO_LINE_BANK_WARMUP_ROUNDS = 3  # 서버 시작 시 미리 채울 총 라운드 수, 0 이면 미리 채우지 않음
+
+# LLM 호출 안정성 설정 (지연 예산 / hedged request / circuit breaker)
+LLM_ENDPOINT_BUDGETS = {  # 엔드포인트별 전체 지연 예산(초), 넘으면 즉시 fallback
+    'default': 15.0,
+    'myomyo': 5.0,
+    'myomyo_bank': 20.0,
+    'lulu_task': 20.0,
+    'lulu_evaluate': 8.0,
+}
+LLM_HEDGE_PERCENTILE = 95  # 응답이 최근 지연의 이 백분위수를 넘으면 같은 요청을 한 번 더 보냄
+LLM_HEDGE_MIN_SAMPLES = 20  # hedge 기준을 계산하기 위한 최소 표본 수
+LLM_LATENCY_WINDOW = 200  # 지연 백분위수 계산에 사용할 최근 표본 수
+LLM_BREAKER_FAILURES = 5  # 연속 실패가 이 수에 도달하면 circuit open
+LLM_BREAKER_RESET = 30.0  # open 후 이 시간(초)이 지나면 시험 요청 1개 허용 (half-open)
+
+# 모델 로딩 설정
+# 서버 시작 시 백그라운드에서 병렬로 미리 로드 + warm-up 할 모델 (콤마 구분, 빈 값이면 요청 시 로드)
+# 채팅 전용 워커는 PRELOAD_MODELS="" 로 실행하여 비전 모델을 로드하지 않음
+# 사용 가능: classifier, classifier_tiny, caption, ocr_recognize, ocr_detect
+PRELOAD_MODELS = [
+    name for name in os.getenv("PRELOAD_MODELS", f"classifier,caption,ocr_{OCR_MODE}").split(",") if name
+]
+
+# 모델 메모리 관리 설정 (사용하지 않는 모델은 내렸다가 요청 시 다시 로드)
+MODEL_MEMORY_BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "0")) or None  # 로드된 모델 전체의 메모리 예산(MB), 초과 시 가장 오래 사용되지 않은 모델부터 내림 (None 이면 제한 없음)
+MODEL_IDLE_TTL = float(os.getenv("MODEL_IDLE_TTL", "0")) or None  # 마지막 사용 후 이 시간(초)이 지난 모델을 내림 (None 이면 내리지 않음)
+MODEL_SWEEP_INTERVAL = 60  # 유휴 모델 정리 주기(초)
+
+# 분류 모델 체크포인트 교체 설정
+CLASSIFIER_WATCH_INTERVAL = 30  # MODEL_PATH 에 새 체크포인트가 있는지 확인하는 주기(초), None 이면 관리자 API 로만 교체
+
+# 분류 모델 추론 backend 설정
+# 'eager' | 'channels_last' | 'torchscript' | 'int8_dynamic' | 'int8_static' | 'onnx'(onnxruntime 필요)
+CLASSIFIER_BACKEND = os.getenv("CLASSIFIER_BACKEND", "eager")
+CLASSIFIER_INTRA_OP_THREADS = int(os.getenv("CLASSIFIER_INTRA_OP_THREADS", "0")) or None  # 워커별 intra-op 스레드 수 (None 이면 torch 기본값)
+CLASSIFIER_PARITY_MIN = 0.99  # eager 대비 top-1 일치율이 이보다 낮으면 eager 로 대체
+CLASSIFIER_CALIBRATION_DIR = os.getenv("CLASSIFIER_CALIBRATION_DIR")  # 일치율 검사 / int8 static calibration 용 샘플 이미지 디렉토리 (없으면 합성 스케치, int8_static 사용 불가)
+CLASSIFIER_CALIBRATION_SIZE = 32  # 일치율 검사 / calibration 에 사용할 이미지 수
+
+# 이미지 캡셔닝(BLIP) 설정
+CAPTION_DTYPE = os.getenv("CAPTION_DTYPE", "fp32")  # 'fp32' | 'bf16' | 'int8'(Linear 레이어 dynamic 양자화)
+CAPTION_MAX_NEW_TOKENS = 20  # 캡션 최대 토큰 수
+CAPTION_NUM_BEAMS = 1  # 1 이면 greedy decoding
+CAPTION_EARLY_STOPPING = True  # beam search 시 모든 beam 이 끝나면 바로 종료
+CAPTION_MAX_BATCH_SIZE = 8  # 한 번의 generate 에 묶을 최대 요청 수
+CAPTION_MAX_WAIT_MS = 10.0  # 배치를 모으기 위해 기다리는 최대 시간(ms)
+CAPTION_MAX_QUEUE = 64  # 배치를 기다리는 최대 요청 수 (초과 시 503)
+CAPTION_ENCODER_CACHE_ENTRIES = 16  # 이미지 해시별로 재사용할 vision encoder 출력 수 (0 이면 사용 안 함)
+
+# 획(stroke) 입력 래스터화 설정
+STROKE_CANVAS_SIZE = 224  # 래스터화할 캔버스 크기(px)
+STROKE_LINE_WIDTH = 3  # 캔버스 기준 선 두께(px)
+STROKE_MARGIN = 0.05  # 캔버스 크기가 주어지지 않아 그림 영역에 맞출 때 가장자리 여백 비율
+STROKE_MAX_POINTS = 10000  # 요청(메시지) 하나에 허용하는 전체 획 점 수
+STROKE_SAMPLE_CHUNK = 1 << 16  # 래스터화 시 한 번에 처리하는 선분 샘플 수 (메모리 사용량 상한)
+
+# 그리는 중 실시간 추측(live guessing) 설정
+LIVE_DEBOUNCE_MS = 300  # 마지막 획 입력 후 이 시간(ms) 동안 새 입력이 없으면 분류
+LIVE_MAX_INTERVAL_MS = 1000  # 계속 그리는 중이어도 이 시간(ms)마다는 분류
+LIVE_MIN_CHANGED_PIXELS = 40  # 마지막 분류 이후 새로 칠해진 픽셀이 이보다 적으면 분류 생략
+LIVE_TOP_K = 3  # 클라이언트에 보낼 예측 수 (상위 k 개 클래스가 바뀔 때만 전송)
+
+# 분류 cascade 설정 (작은 CNN 으로 먼저 분류하고, 확신이 낮은 그림만 EfficientNet 으로 분류)
+CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "false").lower() == "true"
+CASCADE_MODEL_PATH = 'src/image/trained_model/cascade/'  # 작은 CNN(CNNModel, IMAGE_SIZE 입력) 체크포인트 디렉토리 (*.pth 중 최신)
+CASCADE_THRESHOLD = 90.0  # 작은 CNN 의 top-1 신뢰도(%)가 이 이상이면 EfficientNet 을 실행하지 않음
+if CASCADE_ENABLED and "classifier" in PRELOAD_MODELS:
+    PRELOAD_MODELS.append("classifier_tiny")
+
+# 관리자 API 설정
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # 관리자 API 호출 시 X-Admin-Token 헤더로 전달할 토큰 (없으면 관리자 API 비활성화)
@@ -0,0 +1,42 @@
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+import config
+from src.image import classifier
+from src.image.executor import executor
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    X-Admin-Token 헤더가 config.ADMIN_TOKEN 과 일치해야 통과 (ADMIN_TOKEN 이 없으면 관리자 API 비활성화)
+    """
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=['Admin'], dependencies=[Depends(require_admin)])
+
+
+@router.post(
+    "/classifier/reload",
+    summary="분류 모델 체크포인트 교체 API",
+    description=(
+        "MODEL_PATH 의 최신 체크포인트를 별도로 로드하고 warm-up 한 뒤 무중단으로 교체합니다. "
+        "처리 중인 요청은 기존 모델로 끝나며, 로드에 실패하면 기존 모델을 유지합니다. "
+        "교체 후 사용 중인 체크포인트의 경로, sha256, 로드 시간을 반환합니다. "
+        "X-Admin-Token 헤더가 필요합니다."
+    ),
+)
+async def reload_classifier(force: bool = False):
+    if executor.kind == 'process':
+        # 모델은 워커 프로세스마다 따로 있으므로 이 API 로는 한 워커만 교체됨
+        raise HTTPException(status_code=409, detail="process executor: checkpoints are reloaded by each worker's watcher")
+    try:
+        return await asyncio.to_thread(classifier.reload_checkpoint, force)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Checkpoint reload failed: {e}")
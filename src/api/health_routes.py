@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+import config
+from src.image.executor import executor
+from src.image.model_manager import model_manager
+
+router = APIRouter(prefix="/health", tags=['Health'])
+
+
+@router.get(
+    "/live",
+    summary="프로세스 생존 확인 API",
+    description="서버 프로세스가 요청을 처리할 수 있으면 항상 200 을 반환합니다. (모델 로딩 여부와 무관)",
+)
+def live():
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    summary="요청 처리 준비 확인 API",
+    description="PRELOAD_MODELS 의 로드와 warm-up 이 모두 끝났으면 200, 아니면 503 을 모델별 상태와 함께 반환합니다.",
+)
+async def ready():
+    # 모델을 실제로 소유한 쪽(프로세스 풀이면 워커)의 상태로 판단
+    models = await executor.model_status()
+    is_ready = model_manager.is_ready(config.PRELOAD_MODELS, models)
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            "status": "ready" if is_ready else "loading",
+            "preload": config.PRELOAD_MODELS,
+            "models": models,
+        },
+    )
@@ -1,12 +1,85 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Literal, Optional
+import asyncio
+import json
+import logging
 
-from fastapi import APIRouter, File, UploadFile, Body, HTTPException
-from src.image import classifier, preprocessor, img_caption
-from pydantic import BaseModel, Field
-import requests
-from io import BytesIO
+from fastapi import APIRouter, File, UploadFile, Body, HTTPException, Query, WebSocket, WebSocketDisconnect
+from src.image import classifier, preprocessor, img_caption, text_masking, strokes
+from src.image.live import LiveSession
+from src.chat.game_store import GameStore
+from src.image.fetcher import fetcher
+from src.image.executor import executor, InferenceBusyError
+from src.image.batcher import MicroBatcher
+from src.image.cache import result_cache
+import config
+from pydantic import BaseModel, Field, field_validator
 router = APIRouter(prefix="/image", tags=['Image'])
 
+# 동시에 들어온 분류 요청을 하나의 forward 로 묶음
+classify_batcher = MicroBatcher(
+    batch_fn=classifier.classify_batch,
+    executor=executor,
+    stage='classify',
+    max_batch_size=config.CLASSIFY_MAX_BATCH_SIZE,
+    max_wait_ms=config.CLASSIFY_MAX_WAIT_MS,
+    max_queue=config.CLASSIFY_MAX_QUEUE,
+)
+
+# 동시에 들어온 캡셔닝 요청을 하나의 generate 로 묶음
+caption_batcher = MicroBatcher(
+    batch_fn=img_caption.caption_batch,
+    executor=executor,
+    stage='caption',
+    max_batch_size=config.CAPTION_MAX_BATCH_SIZE,
+    max_wait_ms=config.CAPTION_MAX_WAIT_MS,
+    max_queue=config.CAPTION_MAX_QUEUE,
+)
+
+# 게임별 실시간 추측 세션 (방치된 세션은 자동 삭제)
+live_sessions = GameStore("live")
+live_sessions.start_sweeper()
+
+
+async def _masked_image(key: str, bytes_img: bytes):
+    """
+    디코딩 + 텍스트 마스킹 (캐시에 있으면 재사용)
+    """
+    masked = result_cache.get(key, 'masked')
+    if masked is not None:
+        return masked
+
+    image = result_cache.get(key, 'image')
+    if image is None:
+        image = await executor.run('mask', preprocessor.decode, bytes_img)
+        result_cache.put(key, 'image', image)
+
+    masked = await executor.run('mask', text_masking.mask_text, image)
+    result_cache.put(key, 'masked', masked)
+    return masked
+
+
+async def _classify_image(key: str, img, tta: bool = False):
+    """
+    마스킹 된 이미지 분류 후 결과 캐시
+    """
+    if tta:
+        # TTA view 들은 그 자체로 하나의 배치이므로 배칭을 거치지 않음
+        result = await executor.run('classify', classifier.classify, img, tta=True)
+    else:
+        result = await classify_batcher.submit(img)
+    if result[0]['predicted'] != 'unknown':  # 분류 실패 결과는 캐시하지 않음
+        result_cache.put(key, 'classify_tta' if tta else 'classify', result)
+    return result
+
+
+async def _caption_image(key: str, img) -> str:
+    """
+    마스킹 된 이미지 캡셔닝 후 결과 캐시
+    """
+    caption = await caption_batcher.submit((key, img))
+    result_cache.put(key, 'caption', caption)
+    return caption
+
 
 class AiPrediction(BaseModel):
     predicted: str
@@ -19,23 +92,30 @@ class ClassifyRes(BaseModel):
 class ImageReq(BaseModel):
     imageURL: str = Field(description = "Image URL")
 
+class ClassifyReq(ImageReq):
+    tta: bool = Field(default=False, description="Test-time augmentation 사용 여부 (느리지만 조금 더 정확)")
+
 @router.post(
     "/classify",
     summary="이미지 분류 API",
     description="S3 이미지 URL을 받아 QuickDraw 345개 클래스를 기반으로 분류합니다.",
     response_model=ClassifyRes,
 )
-async def classify(request: ImageReq = Body(...)):
+async def classify(request: ClassifyReq = Body(...)):
     try:
-        response = requests.get(request.imageURL)
-        response.raise_for_status()  # HTTPError 발생시 예외 처리
+        bytes_img = await fetcher.fetch(request.imageURL)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Image processing error: {str(e)}")
 
     try:
-        bytes_img = response.content
-        img = preprocessor.preproc(bytes_img)
-        result = classifier.classify(img)
+        key = result_cache.key(bytes_img)
+        field = 'classify_tta' if request.tta else 'classify'
+        result = result_cache.get(key, field)
+        if result is None:
+            img = await _masked_image(key, bytes_img)
+            result = await _classify_image(key, img, tta=request.tta)
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Classification error: {str(e)}")
 
@@ -61,16 +141,218 @@ responses={
 })
 async def captioning(request: ImageReq = Body(...)):
     try:
-        response = requests.get(request.imageURL)
-        response.raise_for_status()  # HTTPError 발생시 예외 처리
+        bytes_img = await fetcher.fetch(request.imageURL)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Image processing error: {str(e)}")
 
     try:
-        bytes_img = response.content
-        img = preprocessor.preproc(bytes_img)
-        caption = img_caption.get_caption(img)
+        key = result_cache.key(bytes_img)
+        caption = result_cache.get(key, 'caption')
+        if caption is None:
+            img = await _masked_image(key, bytes_img)
+            caption = await _caption_image(key, img)
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Captioning error: {str(e)}")
+
+    return caption
+
+
+
+
+class StrokesReq(BaseModel):
+    strokes: List[List[List[float]]] = Field(
+        description="QuickDraw 형식 획 리스트, 각 획은 [[x0, x1, ...], [y0, y1, ...]]"
+    )
+    width: Optional[float] = Field(default=None, gt=0, allow_inf_nan=False, description="클라이언트 캔버스 너비 (없으면 그림 영역에 맞춤)")
+    height: Optional[float] = Field(default=None, gt=0, allow_inf_nan=False, description="클라이언트 캔버스 높이 (없으면 그림 영역에 맞춤)")
+
+    @field_validator('strokes')
+    @classmethod
+    def _limit_points(cls, value: List[List[List[float]]]) -> List[List[List[float]]]:
+        if sum(len(stroke[0]) for stroke in value if stroke) > config.STROKE_MAX_POINTS:
+            raise ValueError(f"too many points (max {config.STROKE_MAX_POINTS})")
+        return value
+
+class ClassifyStrokesReq(StrokesReq):
+    tta: bool = Field(default=False, description="Test-time augmentation 사용 여부 (느리지만 조금 더 정확)")
+
+class ClassifyStrokesRes(BaseModel):
+    result: List[AiPrediction] = Field(description="Classifying result")
+
+
+def _rasterize(request: StrokesReq):
+    try:
+        key = result_cache.key(strokes.strokes_bytes(request.strokes, request.width, request.height))
+        return key, strokes.rasterize(request.strokes, request.width, request.height)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid strokes: {str(e)}")
+
+
+@router.post(
+    "/classify/strokes",
+    summary="획(stroke) 분류 API",
+    description=(
+        "QuickDraw 형식 획 데이터를 받아 서버에서 바로 래스터화하여 분류합니다. "
+        "이미지 업로드 / 다운로드, 디코딩, 텍스트 마스킹을 거치지 않습니다."
+    ),
+    response_model=ClassifyStrokesRes,
+)
+async def classify_strokes(request: ClassifyStrokesReq = Body(...)):
+    key, canvas = await asyncio.to_thread(_rasterize, request)
+    try:
+        field = 'classify_tta' if request.tta else 'classify'
+        result = result_cache.get(key, field)
+        if result is None:
+            result = await _classify_image(key, canvas, tta=request.tta)
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Classification error: {str(e)}")
+
+    return ClassifyStrokesRes(result=result)
+
+
+@router.post(
+    "/caption/strokes",
+    summary="획(stroke) 문장 추출 API",
+    description=(
+        "QuickDraw 형식 획 데이터를 받아 서버에서 바로 래스터화하여 해당 그림을 묘사하는 문장을 반환합니다. "
+        "이미지 업로드 / 다운로드, 디코딩, 텍스트 마스킹을 거치지 않습니다."
+    ),
+)
+async def caption_strokes(request: StrokesReq = Body(...)):
+    key, canvas = await asyncio.to_thread(_rasterize, request)
+    try:
+        caption = result_cache.get(key, 'caption')
+        if caption is None:
+            caption = await _caption_image(key, strokes.to_image(canvas))
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Captioning error: {str(e)}")
 
     return caption
+
+
+
+
+class AnalyzeReq(ImageReq):
+    stages: List[Literal['classify', 'caption']] = Field(
+        default=['classify', 'caption'], description="실행할 분석 단계 (classify, caption)"
+    )
+    tta: bool = Field(default=False, description="분류 시 Test-time augmentation 사용 여부")
+
+class AnalyzeRes(BaseModel):
+    filename: str = Field(description="Image filename")
+    result: Optional[List[AiPrediction]] = Field(default=None, description="Classifying result")
+    caption: Optional[str] = Field(default=None, description="Image caption")
+
+
+@router.post(
+    '/analyze',
+    summary="이미지 통합 분석 API",
+    description="S3 이미지 URL을 받아 한 번의 다운로드/마스킹으로 분류와 캡셔닝을 함께 수행합니다.",
+    response_model=AnalyzeRes,
+)
+async def analyze(request: AnalyzeReq = Body(...)):
+    try:
+        bytes_img = await fetcher.fetch(request.imageURL)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Image processing error: {str(e)}")
+
+    try:
+        key = result_cache.key(bytes_img)
+        result = None
+        caption = None
+        if 'classify' in request.stages:
+            result = result_cache.get(key, 'classify_tta' if request.tta else 'classify')
+        if 'caption' in request.stages:
+            caption = result_cache.get(key, 'caption')
+
+        pending = {}
+        if 'classify' in request.stages and result is None:
+            pending['classify'] = lambda img: _classify_image(key, img, tta=request.tta)
+        if 'caption' in request.stages and caption is None:
+            pending['caption'] = lambda img: _caption_image(key, img)
+
+        if pending:
+            # 다운로드/마스킹은 한 번만 하고, 모델들은 같은 마스킹 이미지로 동시에 실행
+            img = await _masked_image(key, bytes_img)
+            outputs = await asyncio.gather(*(run(img) for run in pending.values()))
+            outputs = dict(zip(pending.keys(), outputs))
+            result = outputs.get('classify', result)
+            caption = outputs.get('caption', caption)
+    except InferenceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
+
+    filename = request.imageURL.split("/")[-1]
+    return AnalyzeRes(filename=filename, result=result, caption=caption)
+
+
+
+@router.websocket("/live/{game_id}")
+async def live_guess(
+    websocket: WebSocket,
+    game_id: str,
+    width: float = Query(..., gt=0, allow_inf_nan=False),
+    height: float = Query(..., gt=0, allow_inf_nan=False),
+):
+    """
+    그리는 중 실시간 추측 WebSocket
+
+    클라이언트 -> 서버
+        {"type": "strokes", "strokes": [[[x...], [y...]], ...], "continues": false}  (continues: 직전 획에 이어지는 조각)
+        {"type": "clear"}
+        {"type": "end"}  (세션 삭제)
+    서버 -> 클라이언트
+        {"type": "guess", "result": [{"predicted": ..., "confidence": ...}, ...]}  (상위 k 개 클래스가 바뀔 때만)
+        {"type": "error", "detail": ...}
+
+    width, height 는 클라이언트 캔버스 크기 (query parameter). 재접속하면 같은 게임의 캔버스를 이어서 사용하며,
+    같은 게임에 이미 연결된 WebSocket 이 있으면 이전 연결을 닫고 새 연결로 교체함.
+    """
+    await websocket.accept()
+    session = live_sessions.get_or_create(game_id, lambda: LiveSession(width, height))
+    if session.pusher is not None:
+        session.pusher.cancel()
+    if session.websocket is not None:
+        try:
+            await session.websocket.close(code=4409, reason="replaced by a new connection")
+        except Exception:
+            pass
+
+    async def push():
+        try:
+            async for result in session.guesses(classify_batcher.submit):
+                await websocket.send_json({"type": "guess", "result": result})
+        except Exception as e:
+            logging.error(f"실시간 추측 중 오류 발생 ({game_id}): {e}")
+
+    pusher = asyncio.create_task(push())
+    session.websocket, session.pusher = websocket, pusher
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise ValueError("message must be a JSON object")
+                if message.get("type") == "end":
+                    live_sessions.pop(game_id, None)
+                    break
+                await session.apply(message)
+            except Exception as e:
+                await websocket.send_json({"type": "error", "detail": f"Invalid message: {str(e)}"})
+            live_sessions.get(game_id)  # 마지막 접근 시각 갱신
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pusher.cancel()
+        if session.websocket is websocket:
+            session.websocket, session.pusher = None, None
+    if websocket.client_state.name == "CONNECTED" and websocket.application_state.name == "CONNECTED":
+        await websocket.close()
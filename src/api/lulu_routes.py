@@ -52,8 +52,8 @@ def start_game():
         }
     }
 )
-def generate_task(game_id: str):
-    task = lulu.generate_drawing_task(game_id)
+async def generate_task(game_id: str):
+    task = await lulu.generate_drawing_task(game_id)
     return task
 
 
@@ -86,7 +86,7 @@ class EvaluationReq(BaseModel):
         }
     }
 )
-def evaluate_task(game_id: str, req: EvaluationReq = Body()):
-    evaluation = lulu.evaluate_drawing(game_id, req.description)
+async def evaluate_task(game_id: str, req: EvaluationReq = Body()):
+    evaluation = await lulu.evaluate_drawing(game_id, req.description)
     lulu.flush_game_data(game_id)
     return evaluation
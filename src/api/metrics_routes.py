@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+
+from src.image.executor import executor
+from src.image.cache import result_cache
+from src.image import classifier, img_caption, text_masking
+from src.api.myomyo_routes import myomyo
+from src.api.lulu_routes import lulu
+from src.api.image_routes import caption_batcher, classify_batcher, live_sessions
+from src.image.live import live_stats
+
+router = APIRouter(prefix="/metrics", tags=['Metrics'])
+
+
+@router.get(
+    "",
+    summary="서버 내부 지표 API",
+    description=(
+        "모델, 추론 실행기, 배칭, 캐시 등 서버 내부 컴포넌트의 현재 지표를 반환합니다. "
+        "thread_executor_only 에 나열된 지표(cascade, caption_encoder_cache, text_gate)는 "
+        "INFERENCE_EXECUTOR='thread' 일 때만 집계되며, 'process' 이면 null 입니다."
+    ),
+)
+async def get_metrics():
+    # 추론 함수 안에서 쌓이는 지표라 thread 실행기에서만 집계됨
+    # (process 실행기에서는 워커 프로세스에 쌓이므로 메인 프로세스의 0 값 대신 null 로 내보냄)
+    inference_local = {
+        "cascade": classifier.cascade_stats(),
+        "caption_encoder_cache": img_caption.encoder_cache_stats(),
+        "text_gate": text_masking.gate_stats(),
+    }
+    if executor.kind == 'process':
+        inference_local = dict.fromkeys(inference_local)
+
+    return {
+        "models": await executor.model_status(),
+        "executor": executor.stats(),
+        "classify_batcher": classify_batcher.stats(),
+        "caption_batcher": caption_batcher.stats(),
+        "result_cache": result_cache.stats(),
+        **inference_local,
+        "thread_executor_only": list(inference_local),
+        "llm": myomyo.llm.stats(),
+        "myomyo_prompt_tokens": myomyo.prompt_stats(),
+        "myomyo_line_bank": myomyo.line_bank.stats(),
+        "games": {
+            "myomyo": myomyo.game_histories.stats(),
+            "lulu": lulu.active_games.stats(),
+            "live": live_sessions.stats(),
+        },
+        "live_guessing": live_stats(),
+        "lulu_task_pool": lulu.task_pool.stats(),
+    }
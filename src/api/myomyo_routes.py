@@ -1,6 +1,8 @@
-from typing import List
+from typing import AsyncIterator, Callable, List, Optional
+import json
 
 from fastapi import APIRouter, Body
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.chat.myomyo import MyoMyoAI
@@ -218,4 +220,112 @@ async def end_game(game_id: str, request: EndGameReq = Body(...,)):
         is_myomyo_win=request.winner == "AI"
     )
     myomyo.cleanup_game(game_id=game_id)
-    return message
\ No newline at end of file
+    return message
+
+
+
+# STREAMING (SSE)
+def _sse(game_id: str, chunks: AsyncIterator[str], on_complete: Optional[Callable[[], None]] = None) -> StreamingResponse:
+    """
+    묘묘의 응답 조각을 Server-Sent Events 로 전달
+    - 생성 중: data: {"delta": "..."}
+    - 완료 시: event: done / data: {"game_id": "...", "message": "전체 메시지"}
+    """
+    async def events():
+        message = []
+        try:
+            async for delta in chunks:
+                message.append(delta)
+                yield f"data: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+            done = {"game_id": game_id, "message": "".join(message).strip()}
+            yield f"event: done\ndata: {json.dumps(done, ensure_ascii=False)}\n\n"
+        finally:
+            # 클라이언트가 중간에 끊어도 대화 기록 저장 / 게임 lock 해제가 GC 를 기다리지 않도록 바로 닫음
+            if hasattr(chunks, 'aclose'):
+                await chunks.aclose()
+            if on_complete is not None:
+                on_complete()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+STREAM_DESCRIPTION = "묘묘의 메시지를 생성되는 대로 Server-Sent Events(text/event-stream)로 전달합니다. 생성이 끝나면 `done` 이벤트로 전체 메시지를 보냅니다."
+
+
+@router.post("/{game_id}/start/stream", summary="게임 시작 메시지 스트리밍 API", description=STREAM_DESCRIPTION)
+async def start_game_stream(game_id: str, request: GameStartReq = Body(...)):
+    chunks = await myomyo.game_start_message(game_id=game_id, players=request.players, stream=True)
+    return _sse(game_id, chunks)
+
+
+@router.post("/{game_id}/round/start/stream", summary="라운드 시작 메시지 스트리밍 API", description=STREAM_DESCRIPTION)
+async def start_round_stream(game_id: str, request: RoundStartReq = Body(...)):
+    chunks = await myomyo.round_start_message(
+        game_id=game_id,
+        round_num=request.roundNum,
+        total_rounds=request.totalRounds,
+        stream=True
+    )
+    return _sse(game_id, chunks)
+
+
+@router.post("/{game_id}/round/end/stream", summary="라운드 종료 메시지 스트리밍 API", description=STREAM_DESCRIPTION)
+async def round_end_stream(game_id: str, request: RoundEndReq = Body(...)):
+    chunks = await myomyo.round_end_message(
+        game_id=game_id,
+        round_num=request.roundNum,
+        total_rounds=request.totalRounds,
+        is_myomyo_win=(request.winner == "AI"),
+        stream=True
+    )
+    return _sse(game_id, chunks)
+
+
+@router.post("/{game_id}/guess/start/stream", summary="추측 시작 메시지 스트리밍 API", description=STREAM_DESCRIPTION)
+async def guess_start_stream(game_id: str, request: GuessStartReq = Body(...)):
+    chunks = await myomyo.guess_start_message(
+        game_id=game_id,
+        round_num=request.roundNum,
+        total_rounds=request.totalRounds,
+        drawer=request.drawer,
+        guesser=request.guesser,
+        stream=True
+    )
+    return _sse(game_id, chunks)
+
+
+@router.post("/{game_id}/guess/stream", summary="AI 정답 추론 스트리밍 API", description=STREAM_DESCRIPTION)
+async def make_guess_stream(game_id: str, request: MakeGuessReq = Body(...)):
+    chunks = await myomyo.guess_message(
+        game_id=game_id,
+        image_description=request.imageDescription,
+        stream=True
+    )
+    return _sse(game_id, chunks)
+
+
+@router.post("/{game_id}/guess/react/stream", summary="예측 결과 반응 메시지 스트리밍 API", description=STREAM_DESCRIPTION)
+async def guess_react_stream(game_id: str, request: GuessReactReq = Body(...)):
+    chunks = await myomyo.react_to_guess_message(
+        game_id=game_id,
+        is_correct=request.is_correct,
+        guesser=request.guesser,
+        answer=request.answer,
+        stream=True
+    )
+    return _sse(game_id, chunks)
+
+
+@router.post("/{game_id}/end/stream", summary="게임 종료 메시지 스트리밍 API", description=STREAM_DESCRIPTION)
+async def end_game_stream(game_id: str, request: EndGameReq = Body(...)):
+    chunks = await myomyo.game_end_message(
+        game_id=game_id,
+        is_myomyo_win=request.winner == "AI",
+        stream=True
+    )
+    # 스트림이 끝난 뒤 대화 기록 정리
+    return _sse(game_id, chunks, on_complete=lambda: myomyo.cleanup_game(game_id=game_id))
@@ -0,0 +1,159 @@
+import logging
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from threading import Event, RLock, Thread
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import config
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    객체가 참조하는 dict / list / src 패키지 객체 속성을 따라가며 대략적인 메모리 크기(bytes) 계산
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, '__dict__') and type(obj).__module__.startswith('src.'):
+        # 우리 상태 객체만 따라감 (asyncio.Lock 등이 참조하는 이벤트 루프까지 세지 않도록)
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class GameStore(MutableMapping):
+    """
+    game_id 별 상태를 저장하는 dict
+    마지막 접근 후 idle_ttl 이 지난 게임은 백그라운드 sweeper 가 삭제하고,
+    max_games 를 넘으면 가장 오래 사용되지 않은 게임부터 삭제함(LRU).
+    클라이언트가 게임 종료 API 를 호출하지 않고 떠난 게임의 메모리 누수를 막기 위함.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        idle_ttl: float = config.GAME_IDLE_TTL,
+        max_games: int = config.GAME_MAX_LIVE,
+        sweep_interval: float = config.GAME_SWEEP_INTERVAL,
+    ):
+        self.name = name
+        self.idle_ttl = idle_ttl
+        self.max_games = max_games
+        self.sweep_interval = sweep_interval
+        self._games: "OrderedDict[str, Any]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._lock = RLock()
+        self._evicted_idle = 0
+        self._evicted_lru = 0
+        self._stop = Event()
+        self._sweeper: Optional[Thread] = None
+
+    def __getitem__(self, game_id: str) -> Any:
+        with self._lock:
+            value = self._games[game_id]
+            self._touch(game_id)
+            return value
+
+    def __setitem__(self, game_id: str, value: Any) -> None:
+        with self._lock:
+            self._games[game_id] = value
+            self._touch(game_id)
+            while len(self._games) > self.max_games:
+                oldest, _ = self._games.popitem(last=False)
+                del self._last_access[oldest]
+                self._evicted_lru += 1
+                logging.info(f"[{self.name}] 게임 수 초과로 게임 삭제: {oldest}")
+
+    def get_or_create(self, game_id: str, factory: Callable[[], Any]) -> Any:
+        """
+        game_id 의 상태를 반환하고, 없으면 factory() 로 생성하여 저장 (원자적으로 처리)
+        """
+        with self._lock:
+            if game_id not in self._games:
+                self[game_id] = factory()
+            return self[game_id]
+
+    def __delitem__(self, game_id: str) -> None:
+        with self._lock:
+            del self._games[game_id]
+            del self._last_access[game_id]
+
+    def __contains__(self, game_id: object) -> bool:
+        with self._lock:
+            return game_id in self._games
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._games))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._games)
+
+    def _touch(self, game_id: str) -> None:
+        self._games.move_to_end(game_id)
+        self._last_access[game_id] = time.monotonic()
+
+    def sweep(self) -> int:
+        """
+        idle_ttl 이 지난 게임 삭제
+
+        Returns:
+            int: 삭제한 게임 수
+        """
+        deadline = time.monotonic() - self.idle_ttl
+        with self._lock:
+            # _games 는 접근 순서대로 정렬되어 있으므로 앞에서부터 만료 여부 확인
+            expired = []
+            for game_id in self._games:
+                if self._last_access[game_id] > deadline:
+                    break
+                expired.append(game_id)
+            for game_id in expired:
+                del self[game_id]
+            self._evicted_idle += len(expired)
+
+        if expired:
+            logging.info(f"[{self.name}] 만료된 게임 {len(expired)}개 삭제")
+        return len(expired)
+
+    def start_sweeper(self) -> None:
+        """
+        sweep_interval 마다 sweep 을 실행하는 데몬 스레드 시작
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+        self._sweeper = Thread(target=self._run_sweeper, name=f"{self.name}-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logging.error(f"[{self.name}] 게임 정리 중 오류 발생: {e}")
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            games = len(self._games)
+            approx_bytes = deep_sizeof(self._games)
+        return {
+            "games": games,
+            "approx_bytes": approx_bytes,
+            "max_games": self.max_games,
+            "idle_ttl": self.idle_ttl,
+            "evicted_idle": self._evicted_idle,
+            "evicted_lru": self._evicted_lru,
+        }
@@ -0,0 +1,84 @@
+import asyncio
+import re
+from typing import Dict, List
+
+import config
+
+MESSAGE_OVERHEAD_TOKENS = 4  # 메시지 하나당 role 등 부가 토큰
+SUMMARY_LINE_CHARS = 60  # 요약 줄 하나에 남길 최대 글자 수
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 대략적인 토큰 수 추정
+    영문/숫자는 4글자당 1토큰, 한글 등 비 ASCII 문자는 글자당 1토큰으로 계산함.
+    """
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_message_tokens(messages: List[Dict]) -> int:
+    return sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+class ConversationHistory:
+    """
+    게임 하나의 대화 기록
+    system prompt 와 최근 메시지는 그대로 유지하고, 토큰 예산을 넘으면 오래된 메시지를
+    짧은 요약 줄로 압축('summarize')하거나 삭제('drop')하여 프롬프트 크기를 일정하게 유지함.
+    """
+
+    def __init__(
+        self,
+        system_prompt: List[Dict],
+        token_budget: int = config.MYOMYO_HISTORY_TOKEN_BUDGET,
+        keep_recent: int = config.MYOMYO_HISTORY_KEEP_RECENT,
+        policy: str = config.MYOMYO_HISTORY_POLICY,
+        summary_tokens: int = config.MYOMYO_HISTORY_SUMMARY_TOKENS,
+    ):
+        if policy not in ('summarize', 'drop'):
+            raise ValueError(f"Unknown history policy: {policy}")
+        self.system_prompt = list(system_prompt)
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.policy = policy
+        self.summary_tokens = summary_tokens
+        self.turns: List[Dict] = []
+        self.summary: List[str] = []
+        # 같은 게임의 턴(프롬프트 추가 → LLM 호출 → 응답 추가)을 순서대로 직렬화하기 위한 게임별 lock
+        self.lock = asyncio.Lock()
+
+    def append(self, role: str, content: str) -> None:
+        self.turns.append({"role": role, "content": content})
+        self._compact()
+
+    def messages(self) -> List[Dict]:
+        """
+        GPT 에 보낼 메시지 리스트 (system prompt + 요약 + 최근 메시지)
+        """
+        messages = list(self.system_prompt)
+        if self.summary:
+            messages.append({
+                "role": "system",
+                "content": "지금까지의 게임 진행 요약:\n" + "\n".join(self.summary)
+            })
+        return messages + self.turns
+
+    def token_count(self) -> int:
+        return count_message_tokens(self.messages())
+
+    def _summarize(self, message: Dict) -> str:
+        speaker = "묘묘" if message["role"] == "assistant" else "진행"
+        content = re.sub(r"\s+", " ", message["content"]).strip()
+        if len(content) > SUMMARY_LINE_CHARS:
+            content = content[:SUMMARY_LINE_CHARS] + "…"
+        return f"- {speaker}: {content}"
+
+    def _compact(self) -> None:
+        while len(self.turns) > self.keep_recent and self.token_count() > self.token_budget:
+            oldest = self.turns.pop(0)
+            if self.policy == 'summarize':
+                self.summary.append(self._summarize(oldest))
+                # 요약도 예산을 넘으면 가장 오래된 줄부터 삭제
+                while self.summary and estimate_tokens("\n".join(self.summary)) > self.summary_tokens:
+                    self.summary.pop(0)
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import config
+from src.chat.game_store import GameStore
+
+PLAYERS_PLACEHOLDER = "{players}"  # 게임 시작 대사에서 플레이어 이름이 들어갈 자리
+
+
+def parse_lines(content: str) -> List[str]:
+    """
+    모델이 생성한 JSON 문자열 배열을 대사 리스트로 변환
+
+    Raises:
+        ValueError: JSON 이 아니거나, 배열이 아니거나, 빈 문자열 / 문자열이 아닌 항목이 있는 경우
+    """
+    lines = json.loads(content)
+    if not isinstance(lines, list) or not lines:
+        raise ValueError(f"expected a non-empty JSON array of strings, got {type(lines).__name__}")
+    if not all(isinstance(line, str) and line.strip() for line in lines):
+        raise ValueError("every line must be a non-empty string")
+    return [line.strip() for line in lines]
+
+
+class LineBank:
+    """
+    묘묘의 정형 이벤트(게임/라운드 시작·종료) 대사 뱅크
+    (이벤트, 파라미터) 조합별로 미리 생성해 둔 대사 중 이번 게임에서 아직 쓰지 않은 것을 무작위로 골라줌.
+    대사가 없는 조합은 백그라운드에서 generator 로 채움.
+
+    generator 는 (프롬프트, 생성할 대사 수)를 받아 대사 리스트를 반환하는 coroutine 함수.
+    """
+
+    def __init__(
+        self,
+        generator: Callable[[str, int], Awaitable[List[str]]],
+        variants: int = config.MYOMYO_LINE_BANK_VARIANTS,
+        path: Optional[str] = config.MYOMYO_LINE_BANK_PATH,
+    ):
+        self.generator = generator
+        self.variants = variants
+        self._lines: Dict[str, List[str]] = {}
+        self._used = GameStore("myomyo-lines")  # game_id 별 이미 사용한 대사 (방치된 게임은 자동 삭제)
+        self._used.start_sweeper()
+        self._filling: Dict[str, asyncio.Task] = {}
+        self._hits = 0
+        self._misses = 0
+        self._fills = 0
+        if path:
+            self.load(path)
+
+    @staticmethod
+    def key(event: str, params: Tuple) -> str:
+        return "|".join([event, *map(str, params)])
+
+    def pick(self, game_id: str, event: str, params: Tuple) -> Optional[str]:
+        """
+        이번 게임에서 아직 사용하지 않은 대사를 무작위로 선택 (없으면 None)
+        """
+        lines = self._lines.get(self.key(event, params), [])
+        used = self._used.get_or_create(game_id, set)
+        candidates = [line for line in lines if line not in used]
+        if not candidates:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        line = random.choice(candidates)
+        used.add(line)
+        return line
+
+    def schedule_fill(self, event: str, params: Tuple, prompt: str) -> None:
+        """
+        해당 조합의 대사가 부족하면 백그라운드 생성 시작 (조합별로 동시에 하나만 실행)
+        """
+        key = self.key(event, params)
+        if len(self._lines.get(key, [])) >= self.variants:
+            return
+        if key in self._filling and not self._filling[key].done():
+            return
+        self._filling[key] = asyncio.get_running_loop().create_task(self.fill(event, params, prompt))
+
+    async def fill(self, event: str, params: Tuple, prompt: str) -> None:
+        key = self.key(event, params)
+        try:
+            lines = await self.generator(prompt, self.variants)
+        except Exception as e:
+            logging.error(f"대사 뱅크 생성 실패 ({key}): {e}")
+            return
+        merged = self._lines.get(key, []) + [line for line in lines if line]
+        # 중복 제거 후 최근 것 위주로 variants 개 유지
+        self._lines[key] = list(dict.fromkeys(merged))[-self.variants:]
+        self._fills += 1
+
+    async def wait_filling(self) -> None:
+        """
+        진행 중인 백그라운드 생성이 모두 끝날 때까지 대기
+        """
+        await asyncio.gather(*self._filling.values())
+
+    def forget_game(self, game_id: str) -> None:
+        self._used.pop(game_id, None)
+
+    def load(self, path: str) -> None:
+        with open(path, encoding='utf-8') as f:
+            self._lines.update(json.load(f))
+        logging.info(f"대사 뱅크 로드: {path} ({len(self._lines)}개 조합)")
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self._lines, f, ensure_ascii=False, indent=2)
+
+    def stats(self) -> Dict:
+        return {
+            "keys": len(self._lines),
+            "lines": sum(len(lines) for lines in self._lines.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "fills": self._fills,
+        }
+
+
+if __name__ == '__main__':
+    # 오프라인 대사 뱅크 생성: python -m src.chat.line_bank <출력 JSON 경로> [총 라운드 수]
+    import os
+    import sys
+
+    from src.chat.myomyo import MyoMyoAI
+
+    async def main(path: str, total_rounds: int):
+        myomyo = MyoMyoAI(api_key=os.getenv("OPENAI_API_KEY"))
+        await myomyo.fill_line_bank(total_rounds)
+        myomyo.line_bank.save(path)
+        print(myomyo.line_bank.stats())
+
+    asyncio.run(main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 3))
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from threading import Lock
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+import config
+from src.chat.resilience import CircuitOpenError, EndpointPolicy
+
+
+class LLMClient:
+    """
+    비동기 OpenAI 클라이언트
+    하나의 httpx 커넥션 풀을 공유하며, 프로세스 전체의 동시 호출 수를 제한함.
+    base_url 을 지정하면 OpenAI 호환 서버(로컬 fake 서버 등)로 요청함.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = config.LLM_BASE_URL,
+        timeout: float = config.LLM_TIMEOUT,
+        max_concurrency: int = config.LLM_MAX_CONCURRENCY,
+    ):
+        self.timeout = timeout
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(timeout, connect=config.LLM_CONNECT_TIMEOUT),
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self.http_client,
+            max_retries=config.LLM_MAX_RETRIES,
+        )
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._policies: Dict[str, EndpointPolicy] = {}
+
+    def policy(self, endpoint: str) -> EndpointPolicy:
+        """
+        엔드포인트별 지연 예산 / hedge / circuit breaker 정책
+        """
+        if endpoint not in self._policies:
+            budgets = config.LLM_ENDPOINT_BUDGETS
+            self._policies[endpoint] = EndpointPolicy(endpoint, budgets.get(endpoint, budgets['default']))
+        return self._policies[endpoint]
+
+    async def chat(self, messages: List[Dict], endpoint: str = 'default', timeout: Optional[float] = None, **kwargs) -> str:
+        """
+        Chat Completion 호출
+        엔드포인트의 지연 예산 안에서 실행되며, 느리면 hedged request 를 보내고
+        upstream 장애 시(circuit open) 호출 없이 즉시 CircuitOpenError 를 발생시킴.
+
+        Args:
+            messages: GPT 메시지 리스트
+            endpoint: 정책(지연 예산 등)을 구분하는 이름 (config.LLM_ENDPOINT_BUDGETS)
+            timeout: 이번 호출의 지연 예산(초), 기본값은 엔드포인트 예산
+            **kwargs: model, temperature, max_tokens 등
+
+        Returns:
+            str: 응답 메시지 (앞뒤 공백 제거)
+        """
+        policy = self.policy(endpoint)
+        budget = timeout or policy.budget
+
+        async def attempt():
+            async with self._semaphore:
+                self._in_flight += 1
+                try:
+                    return await self.client.chat.completions.create(
+                        messages=messages,
+                        timeout=budget,
+                        **kwargs
+                    )
+                finally:
+                    self._in_flight -= 1
+
+        response = await policy.call(attempt, budget=budget)
+        return response.choices[0].message.content.strip()
+
+    async def chat_stream(self, messages: List[Dict], endpoint: str = 'default', timeout: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Chat Completion 스트리밍 호출
+        스트림은 hedge 하지 않고, circuit breaker 와 첫 토큰까지의 지연 예산만 적용함.
+        스트림 도중 발생한 오류도 circuit breaker 에 실패로 기록됨.
+
+        Args:
+            messages: GPT 메시지 리스트
+            endpoint: 정책(지연 예산 등)을 구분하는 이름 (config.LLM_ENDPOINT_BUDGETS)
+            timeout: 이번 호출의 제한 시간(초), 기본값은 엔드포인트 예산
+            **kwargs: model, temperature, max_tokens 등
+
+        Yields:
+            str: 생성되는 토큰 조각
+        """
+        policy = self.policy(endpoint)
+        budget = timeout or policy.budget
+        if not policy.breaker.allow():
+            raise CircuitOpenError(f"LLM circuit open: {endpoint}")
+
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                start = time.perf_counter()
+                stream = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        messages=messages,
+                        timeout=budget,
+                        stream=True,
+                        **kwargs
+                    ),
+                    budget
+                )
+                policy.latency.record(time.perf_counter() - start)
+                policy.breaker.record_success()
+            except asyncio.CancelledError:
+                policy.breaker.release_trial()
+                raise
+            except Exception:
+                policy.breaker.record_failure()
+                raise
+            finally:
+                self._in_flight -= 1
+
+            completed = False
+            closed_by_consumer = False
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                completed = True
+            except GeneratorExit:
+                # 소비자(SSE 클라이언트)가 중간에 닫은 경우는 upstream 장애가 아님
+                closed_by_consumer = True
+                raise
+            finally:
+                # 소비자가 중간에 끊어도 GC 를 기다리지 않고 upstream 응답(커넥션)과 동시 호출 슬롯을 바로 반환함
+                await stream.close()
+                if not completed and not closed_by_consumer:
+                    # 첫 토큰 이후 스트림 도중 끊기거나 시간 초과 / 취소된 경우도 upstream 장애로 기록
+                    policy.breaker.record_failure()
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "endpoints": {name: policy.stats() for name, policy in self._policies.items()},
+        }
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+_clients: Dict[tuple, LLMClient] = {}
+_clients_lock = Lock()
+
+
+def get_llm_client(api_key: str, base_url: Optional[str] = config.LLM_BASE_URL) -> LLMClient:
+    """
+    같은 API 키 / 주소를 쓰는 캐릭터들이 하나의 클라이언트(커넥션 풀)를 공유하도록 반환
+    """
+    with _clients_lock:
+        key = (api_key, base_url)
+        if key not in _clients:
+            _clients[key] = LLMClient(api_key=api_key, base_url=base_url)
+        return _clients[key]
+
+
+async def close_llm_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        await client.close()
@@ -1,6 +1,8 @@
-from openai import OpenAI
 from threading import Lock
-from typing import Dict, List
+from typing import Dict, List, Optional
+from src.chat.llm import get_llm_client
+from src.chat.game_store import GameStore
+from src.chat.task_pool import TaskPool
 import json
 import random
 
@@ -27,11 +29,13 @@ class LuLuAI:
         with self._lock:
             if self._initialized:
                 return
-            self.client = OpenAI(api_key=api_key)
+            self.llm = get_llm_client(api_key)
             self.model = model
             self._initialized = True
-            self.active_games = {}  # gameId별 현재 task만 저장
+            self.active_games = GameStore("lulu")  # gameId별 현재 task만 저장, 방치된 게임은 자동 삭제
+            self.active_games.start_sweeper()
             self.global_used_keywords = []  # 전역 사용된 키워드 저장 (최대 30개)
+            self.task_pool = TaskPool(self._create_task, lambda: self.global_used_keywords)  # 미리 생성해 둔 그림 과제
 
     def create_game(self) -> str:
         """
@@ -76,20 +80,16 @@ class LuLuAI:
             del self.active_games[game_id]
 
 
-    def generate_drawing_task(self, game_id: str) -> Dict:
+    async def _create_task(self, exclude_keywords: List[str]) -> Dict:
         """
-        요청 단계: AI가 추상적이고 시적인 표현으로 그림 과제 제시
+        LLM 으로 새 그림 과제 생성 (높은 temperature)
 
         Args:
-            game_id: 게임 ID
+            exclude_keywords: 사용하면 안 되는 키워드 목록
 
         Returns:
-            Dict: {"keyword": str, "situation": str, "game_id": str}
+            Dict: {"keyword": str, "situation": str}
         """
-        if game_id not in self.active_games:
-            raise ValueError("Invalid game ID")
-
-
         system_prompt = f"""
         너는 꿈과 환상을 다루는 신비로운 이야기꾼이야. 
         사용자에게 그림을 그리게 하고 싶은데, 직접적으로 말하지 말고 매우 추상적이고 시적으로 표현해줘.
@@ -98,7 +98,7 @@ class LuLuAI:
         - 핵심 키워드(명사)를 정하되, 절대 그 단어를 직접 언급하지 마
         - 해석의 여지가 많도록 추상적으로
         
-        {f"이미 사용된 키워드들 (절대 사용하지 마): {', '.join(self.global_used_keywords)}" if self.global_used_keywords else ""}
+        {f"이미 사용된 키워드들 (절대 사용하지 마): {', '.join(exclude_keywords)}" if exclude_keywords else ""}
 
         다양한 주제를 다뤄줘 (자연, 감정, 사물, 추상 개념, 동물, 건물, 음식, 계절, 색깔, 직업 등).
 
@@ -106,31 +106,43 @@ class LuLuAI:
         {{"keyword": "숨겨진 키워드", "situation": "시적이고 추상적인 묘사"}}
         """
 
+        content = await self.llm.chat(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "새로운 그림 주제를 시적으로 표현해줘."}
+            ],
+            temperature=1.0,
+            max_tokens=2048,
+            top_p=1.0,
+            endpoint="lulu_task"
+        )
+
+        # JSON 파싱
+        task_data = json.loads(content)
+        return {"keyword": task_data["keyword"], "situation": task_data["situation"]}
+
+    async def generate_drawing_task(self, game_id: str) -> Dict:
+        """
+        요청 단계: AI가 추상적이고 시적인 표현으로 그림 과제 제시
+        미리 생성해 둔 과제 풀에서 꺼내고, 풀이 비어 있을 때만 LLM 을 직접 호출함.
+
+        Args:
+            game_id: 게임 ID
+
+        Returns:
+            Dict: {"keyword": str, "situation": str, "game_id": str}
+        """
+        if game_id not in self.active_games:
+            raise ValueError("Invalid game ID")
+
         try:
-            # response = self.client.chat.completions.create(
-            #     model=self.model,
-            #     messages=[
-            #         {"role": "system", "content": system_prompt},
-            #         {"role": "user", "content": "새로운 그림 주제를 시적으로 표현해줘."}
-            #     ],
-            #     temperature=1.0,
-            #     max_tokens=2048,
-            #     top_p=1.0
-            # )
-
-            # # JSON 파싱
-            # content = response.choices[0].message.content.strip()
-            # print(content)
-
-            #
-            #
-            # task_data = json.loads(content)
-            task_data = dict()
-            task_data['keyword'] = '불꽃놀이'
-            task_data['situation'] = """어둠이 숨을 죽이고 있을 때, 하늘에 누군가의 기분이 터지는 걸 보았어. 반짝임이 너무 빨라서 눈이 따라가지 못했지만, 그 짧은 순간만큼은 모두가 같은 쪽을 보고 있었지. 그 장면, 나한테 다시 보여줄 수 있을까?"""
+            task_data = self.task_pool.take()
+            if task_data is None:
+                task_data = await self._create_task(self.global_used_keywords)
 
             task_data["game_id"] = game_id
-            self.global_used_keywords.append(task_data['keyword'])
+            self._update_global_keywords(task_data['keyword'])
             self.active_games[game_id] = task_data
             return task_data
 
@@ -144,13 +156,14 @@ class LuLuAI:
             }
             return fallback_task
 
-    def evaluate_drawing(self, game_id: str, drawing_description: str) -> Dict:
+    async def evaluate_drawing(self, game_id: str, drawing_description: str, timeout: Optional[float] = None) -> Dict:
         """
         평가 단계: AI가 사용자의 그림을 숨겨진 키워드와 비교하여 평가
 
         Args:
             game_id: 게임 ID
             drawing_description: 사용자가 그린 그림의 텍스트 설명
+            timeout: LLM 호출 지연 예산(초, default: config.LLM_ENDPOINT_BUDGETS['lulu_evaluate'])
 
         Returns:
             Dict: {"score": int, "feedback": str, "task": Dict}
@@ -202,7 +215,7 @@ class LuLuAI:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            content = await self.llm.chat(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -210,10 +223,11 @@ class LuLuAI:
                 ],
                 temperature=0.2,
                 max_tokens=300,
-                top_p=1.00
+                top_p=1.00,
+                endpoint="lulu_evaluate",
+                timeout=timeout
             )
 
-            content = response.choices[0].message.content.strip()
             evaluation = json.loads(content)
             evaluation["task"] = current_task
             evaluation["game_id"] = game_id
@@ -1,6 +1,20 @@
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from threading import Lock
-from openai import OpenAI
+import contextlib
+import random
+import config
+from src.chat.llm import get_llm_client
+from src.chat.history import ConversationHistory, count_message_tokens
+from src.chat.game_store import GameStore
+from src.chat.line_bank import LineBank, PLAYERS_PLACEHOLDER, parse_lines
+
+
+async def _as_stream(text: str) -> AsyncIterator[str]:
+    """
+    완성된 문장을 한 조각짜리 스트림으로 변환
+    """
+    yield text
+
 
 class MyoMyoAI:
     """
@@ -8,7 +22,7 @@ class MyoMyoAI:
     싱글톤 패턴으로 전역에 저장되며, 게임 별 기록은 클래스 내에서 게임ID로 구분함.
     """
     _instance = None
-    _lock = Lock() # 동시성 처리를 위한 Lock 설정
+    _lock = Lock() # 싱글톤 생성용 Lock (게임별 기록은 각 ConversationHistory 의 lock 으로 보호)
 
     def __new__(cls, *args, **kwargs):
         with cls._lock:
@@ -28,10 +42,14 @@ class MyoMyoAI:
         with self._lock:
             if self._initialized:
                 return
-            self.client = OpenAI(api_key=api_key)
+            self.llm = get_llm_client(api_key)
             self.model = model
             self._initialized = True
-            self.game_histories = {} # game_id로 구분됨
+            self.game_histories: Dict[str, ConversationHistory] = GameStore("myomyo") # game_id로 구분됨, 방치된 게임은 자동 삭제
+            self.game_histories.start_sweeper()
+            self._prompt_tokens = {"calls": 0, "total": 0, "last": 0, "max": 0} # 호출별 전송 토큰 통계
+            self._stats_lock = Lock()
+            self.line_bank = LineBank(self._generate_bank_lines) # 정형 이벤트 대사 뱅크
 
     def _get_init_system_prompt(self) -> List[Dict]:
         return [
@@ -61,13 +79,16 @@ class MyoMyoAI:
             }
         ]
 
-    def _ensure_game_exists(self, game_id: str) -> None:
+    def _ensure_game_exists(self, game_id: str) -> ConversationHistory:
         """
         해당 게임 ID의 대화 기록이 없다면 초기화
+
+        Returns:
+            해당 게임의 대화 기록
         """
-        with self._lock:
-            if game_id not in self.game_histories:
-                self.game_histories[game_id] = self._get_init_system_prompt()
+        return self.game_histories.get_or_create(
+            game_id, lambda: ConversationHistory(self._get_init_system_prompt())
+        )
 
 
 
@@ -79,67 +100,205 @@ class MyoMyoAI:
             role: GPT Role
             content: 메시지
         """
-        self._ensure_game_exists(game_id)
-        with self._lock:
-            self.game_histories[game_id].append({
-                "role": role,
-                "content": content
-            })
+        self._ensure_game_exists(game_id).append(role, content)
 
 
-    async def generate_response(self, game_id: str, prompt: str, role: str = "system") -> str:
+    def _record_prompt_tokens(self, tokens: int) -> None:
+        with self._stats_lock:
+            stats = self._prompt_tokens
+            stats["calls"] += 1
+            stats["total"] += tokens
+            stats["last"] = tokens
+            stats["max"] = max(stats["max"], tokens)
+
+    def prompt_stats(self) -> Dict:
+        """
+        LLM 호출별 전송 토큰 수(추정) 통계
+        """
+        with self._stats_lock:
+            stats = dict(self._prompt_tokens)
+        stats["avg"] = stats["total"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+    async def generate_response(self, game_id: str, prompt: str, role: str = "system", timeout: Optional[float] = None) -> str:
         """
         특정 게임에 대한 묘묘의 응답 생성
         Args:
             game_id: 게임 ID
             role: GPT Role(default: "system")
             prompt: 추가 프롬프트
+            timeout: LLM 호출 지연 예산(초, default: config.LLM_ENDPOINT_BUDGETS['myomyo'])
 
         Returns:
             묘묘의 응답
         """
-        self._ensure_game_exists(game_id)
-        with self._lock:
-            messages = self.game_histories[game_id]
+        history = self._ensure_game_exists(game_id)
+
+        # 다른 게임과는 경쟁하지 않고, 같은 게임의 턴은 요청 순서대로 처리
+        async with history.lock:
+            if prompt:
+                history.append(role, prompt)
 
-        if prompt:
-            messages.append({
-                "role": role,
-                "content": prompt
-            })
+            messages = history.messages()
+            self._record_prompt_tokens(count_message_tokens(messages))
 
-        try:
-            responses = self.client.chat.completions.create(
-                model = self.model,
-                messages = messages,
-                temperature = 0.8, # 모델 출력의 무작위성 제어
-                max_tokens = 250
-            )
+            try:
+                ai_response = await self.llm.chat(
+                    model = self.model,
+                    messages = messages,
+                    temperature = 0.8, # 모델 출력의 무작위성 제어
+                    max_tokens = 250,
+                    endpoint = "myomyo",
+                    timeout = timeout
+                )
 
-            ai_response = responses.choices[0].message.content.strip()
+                history.append("assistant", ai_response)
 
-            with self._lock:
-                self.game_histories[game_id].append({
-                    "role": "assistant",
-                    "content": ai_response
-                })
+                return ai_response
 
-            return ai_response
+            except Exception as e:
+                print(f'GPT 응답 생성중 오류 발생 : {e}')
+                return "으.. 잠깐 오류가 났네. 다시 해볼게!"
 
-        except Exception as e:
-            print(f'GPT 응답 생성중 오류 발생 : {e}')
-            return "으.. 잠깐 오류가 났네. 다시 해볼게!"
+    async def generate_response_stream(self, game_id: str, prompt: str, role: str = "system", timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        특정 게임에 대한 묘묘의 응답을 토큰 단위로 스트리밍
+        스트림이 끝나면(클라이언트가 중간에 끊은 경우 포함) 생성된 문장을 대화 기록에 저장함.
+
+        Args:
+            game_id: 게임 ID
+            role: GPT Role(default: "system")
+            prompt: 추가 프롬프트
+            timeout: LLM 호출 지연 예산(초, default: config.LLM_ENDPOINT_BUDGETS['myomyo'])
 
-    async def game_start_message(self, game_id: str, players: List[str]) -> str:
+        Yields:
+            묘묘의 응답 조각
+        """
+        history = self._ensure_game_exists(game_id)
+
+        async with history.lock:
+            if prompt:
+                history.append(role, prompt)
+
+            messages = history.messages()
+            self._record_prompt_tokens(count_message_tokens(messages))
+
+            chunks = []
+            try:
+                # 클라이언트가 중간에 끊으면 LLM 스트림도 바로 닫음
+                async with contextlib.aclosing(self.llm.chat_stream(
+                    model = self.model,
+                    messages = messages,
+                    temperature = 0.8,
+                    max_tokens = 250,
+                    endpoint = "myomyo",
+                    timeout = timeout
+                )) as stream:
+                    async for delta in stream:
+                        chunks.append(delta)
+                        yield delta
+
+            except Exception as e:
+                print(f'GPT 응답 스트리밍 중 오류 발생 : {e}')
+                if not chunks:
+                    yield "으.. 잠깐 오류가 났네. 다시 해볼게!"
+
+            finally:
+                ai_response = "".join(chunks).strip()
+                if ai_response:
+                    history.append("assistant", ai_response)
+
+    async def _generate_bank_lines(self, prompt: str, count: int) -> List[str]:
+        """
+        대사 뱅크용으로 한 이벤트에 대한 서로 다른 대사 count 개를 한 번의 호출로 생성
+        """
+        content = await self.llm.chat(
+            model = self.model,
+            messages = self._get_init_system_prompt() + [
+                {"role": "system", "content": prompt},
+                {"role": "system", "content": f"위 상황에서 묘묘가 할 법한 서로 다른 대사 {count}개를 JSON 문자열 배열로만 출력해줘."}
+            ],
+            temperature = 1.0,
+            max_tokens = 150 * count,
+            endpoint = "myomyo_bank"
+        )
+        return parse_lines(content)
+
+    def _bank_prompt(self, event: str, params: Tuple) -> str:
+        """
+        대사 뱅크 생성용 프롬프트 (게임 시작 대사는 플레이어 이름 자리에 placeholder 사용)
+        """
+        if event == "game_start":
+            return self._game_start_prompt([PLAYERS_PLACEHOLDER])
+        if event == "round_start":
+            return self._round_start_prompt(*params)
+        if event == "round_end":
+            return self._round_end_prompt(*params)
+        if event == "game_end":
+            return self._game_end_prompt(*params)
+        raise ValueError(f"Unknown line bank event: {event}")
+
+    def schedule_line_bank_fill(self, total_rounds: int) -> None:
+        """
+        total_rounds 판 게임의 모든 정형 이벤트 대사를 백그라운드에서 생성
+        """
+        events = [("game_start", ())]
+        for round_num in range(1, total_rounds + 1):
+            events.append(("round_start", (round_num, total_rounds)))
+            events.extend(("round_end", (round_num, total_rounds, win)) for win in (True, False))
+        events.extend(("game_end", (win,)) for win in (True, False))
+
+        for event, params in events:
+            self.line_bank.schedule_fill(event, params, self._bank_prompt(event, params))
+
+    async def fill_line_bank(self, total_rounds: int) -> None:
+        self.schedule_line_bank_fill(total_rounds)
+        await self.line_bank.wait_filling()
+
+    async def _commit_line(self, game_id: str, prompt: str, line: str) -> None:
+        """
+        뱅크에서 꺼낸 대사도 대화 기록에 남겨 이후 대화 맥락을 유지
+        """
+        history = self._ensure_game_exists(game_id)
+        async with history.lock:
+            history.append("system", prompt)
+            history.append("assistant", line)
+
+    async def _respond(self, game_id: str, prompt: str, stream: bool, bank: Optional[Tuple[str, Tuple]] = None, players: Optional[str] = None) -> Union[str, AsyncIterator[str]]:
+        """
+        stream 이면 응답 스트림(async generator)을, 아니면 완성된 응답을 반환
+        bank=(이벤트, 파라미터) 가 주어지면 대사 뱅크에서 먼저 찾고, 없을 때만 실시간 생성함.
+        """
+        if bank is not None and config.MYOMYO_LINE_BANK_ENABLED:
+            event, params = bank
+            line = None
+            if random.random() >= config.MYOMYO_LINE_BANK_LIVE_RATIO:
+                line = self.line_bank.pick(game_id, event, params)
+            self.line_bank.schedule_fill(event, params, self._bank_prompt(event, params))
+
+            if line is not None:
+                if players is not None:
+                    line = line.replace(PLAYERS_PLACEHOLDER, players)
+                await self._commit_line(game_id, prompt, line)
+                return _as_stream(line) if stream else line
+
+        if stream:
+            return self.generate_response_stream(game_id=game_id, role="system", prompt=prompt)
+        return await self.generate_response(game_id=game_id, role="system", prompt=prompt)
+
+    async def game_start_message(self, game_id: str, players: List[str], stream: bool = False) -> Union[str, AsyncIterator[str]]:
         """
         게임 시작시 묘묘의 도발 메시지
         """
+        prompt = self._game_start_prompt(players)
+        return await self._respond(game_id, prompt, stream, bank=("game_start", ()), players=", ".join(players))
+
+    def _game_start_prompt(self, players: List[str]) -> str:
         player_names = ", ".join(players)
-        prompt = f"""새로운 그림 맞추기 게임이 '{player_names}' 플레이어들과 시작됐어.
+        return f"""새로운 그림 맞추기 게임이 '{player_names}' 플레이어들과 시작됐어.
         게임 시작을 알리는 도발적이고 재미있는 인사를 해줘."""
-        return await self.generate_response(game_id=game_id, role="system", prompt=prompt)
 
-    async def round_start_message(self, game_id: str, round_num: int, total_rounds: int) -> str:
+    async def round_start_message(self, game_id: str, round_num: int, total_rounds: int, stream: bool = False) -> Union[str, AsyncIterator[str]]:
         """
         라운드 시작 시 묘묘의 도발 메시지
         Args:
@@ -147,22 +306,26 @@ class MyoMyoAI:
             drawing_player: 이번 라운드에 그림을 그릴 플레이어 이름
             round_num: 현재 라운드 번호
             total_rounds: 전체 라운드
+            stream: True 면 응답 스트림 반환
         """
-        prompt = f"""이제 {total_rounds} 개의 라운드 중에 {round_num}번째 라운드가 시작되었어.
+        prompt = self._round_start_prompt(round_num, total_rounds)
+        return await self._respond(game_id, prompt, stream, bank=("round_start", (round_num, total_rounds)))
+
+    def _round_start_prompt(self, round_num: int, total_rounds: int) -> str:
+        return f"""이제 {total_rounds} 개의 라운드 중에 {round_num}번째 라운드가 시작되었어.
                 라운드 시작을 알리는 짧고 도발적인 멘트를 해줘."""
-        return await self.generate_response(game_id=game_id, role="system", prompt=prompt)
 
 
-    async def guess_start_message(self, game_id, round_num, total_rounds, drawer, guesser):
+    async def guess_start_message(self, game_id, round_num, total_rounds, drawer, guesser, stream: bool = False):
         """
         drawer가 그린 그림에 대해서 추측을 시작할 차례.
         """
         prompt = f"""지금 {total_rounds} 개의 라운드 중에 {round_num}번째 라운드야. 
         이제 {'너' if guesser == 'AI' else guesser}가 그림을 맞출 차례야. {drawer}가 그린 그림이 뭔지를 어떻게 맞출지 {'포부를 보여줄래? ' if guesser == "AI" else '도발을 한 번 해볼래?'}"""
-        return await self.generate_response(game_id = game_id, role="system", prompt = prompt)
+        return await self._respond(game_id, prompt, stream)
 
 
-    async def guess_message(self, game_id: str, image_description: str) -> str:
+    async def guess_message(self, game_id: str, image_description: str, stream: bool = False) -> Union[str, AsyncIterator[str]]:
 
         """
         그림 추측 상호작용(묘묘의 추측)\n
@@ -171,6 +334,7 @@ class MyoMyoAI:
         Args:
             game_id: game id
             image_description: 이미지 분석 결과
+            stream: True 면 응답 스트림 반환
         Returns:
             묘묘의 멘트
         """
@@ -181,10 +345,10 @@ class MyoMyoAI:
         이 때 대화 기록을 바탕으로 이미 추측에 실패한 답변은 하지 말아줘.
         '''
 
-        return await self.generate_response(game_id = game_id, role = "system", prompt = prompt)
+        return await self._respond(game_id, prompt, stream)
 
 
-    async def react_to_guess_message(self, game_id: str, is_correct: bool, answer: str, guesser: str = None) -> str:
+    async def react_to_guess_message(self, game_id: str, is_correct: bool, answer: str, guesser: str = None, stream: bool = False) -> Union[str, AsyncIterator[str]]:
         """
          추측 결과에 대한 묘묘의 반응
 
@@ -193,6 +357,7 @@ class MyoMyoAI:
              is_correct: 추측이 맞았는지 여부
              answer: 실제 정답
              guesser: 누가 추측했는지 (묘묘 또는 플레이어 이름)
+             stream: True 면 응답 스트림 반환
 
          Returns:
              묘묘의 반응
@@ -207,32 +372,39 @@ class MyoMyoAI:
             prompt = f"""플레이어 '{guesser}'가 방금 추측을 했어. {f"정답은 '{answer}'야" if is_correct else ""}. 플레이어의 추측은 {'맞았어' if is_correct else '틀렸어'}.
              이 결과에 대한 너의 반응을 짧고 도발적으로 말해줘."""
 
-        return await self.generate_response(game_id=game_id, role="system", prompt=prompt)
+        return await self._respond(game_id, prompt, stream)
 
 
-    async def round_end_message(self, game_id: str, round_num: int, total_rounds: int, is_myomyo_win: bool) -> str:
+    async def round_end_message(self, game_id: str, round_num: int, total_rounds: int, is_myomyo_win: bool, stream: bool = False) -> Union[str, AsyncIterator[str]]:
         """
         라운드 종료에 대한 묘묘의 반응
 
         """
-        prompt = f"""{total_rounds} 개의 라운드 중에 {round_num} 번째 라운드가 종료되었어. 너는 {'이겼어' if is_myomyo_win else '졌어'}. 게임 결과에 대한 너의 생각을 도발적이고 재미있게 말해줘."""
-        return await self.generate_response(game_id = game_id, role="system", prompt = prompt)
+        prompt = self._round_end_prompt(round_num, total_rounds, is_myomyo_win)
+        return await self._respond(game_id, prompt, stream, bank=("round_end", (round_num, total_rounds, is_myomyo_win)))
+
+    def _round_end_prompt(self, round_num: int, total_rounds: int, is_myomyo_win: bool) -> str:
+        return f"""{total_rounds} 개의 라운드 중에 {round_num} 번째 라운드가 종료되었어. 너는 {'이겼어' if is_myomyo_win else '졌어'}. 게임 결과에 대한 너의 생각을 도발적이고 재미있게 말해줘."""
 
 
 
-    async def game_end_message(self, game_id: str, is_myomyo_win: bool) -> str:
+    async def game_end_message(self, game_id: str, is_myomyo_win: bool, stream: bool = False) -> Union[str, AsyncIterator[str]]:
         """
         게임 종료에 대한 묘묘의 반응
         Args:
             game_id: game id
             is_myomyo_win: 묘묘 승리 여부
+            stream: True 면 응답 스트림 반환
         Returns:
             묘묘의 반응
         """
-        prompt = f"""게임이 종료되었어.
+        prompt = self._game_end_prompt(is_myomyo_win)
+        return await self._respond(game_id, prompt, stream, bank=("game_end", (is_myomyo_win,)))
+
+    def _game_end_prompt(self, is_myomyo_win: bool) -> str:
+        return f"""게임이 종료되었어.
         너(묘묘)는 {"이겼어" if is_myomyo_win else "졌어"}.
         게임 결과에 대한 너의 생각을 도발적이고 재미있게 말해줘."""
-        return await self.generate_response(game_id=game_id, role="system", prompt=prompt)
 
     def cleanup_game(self, game_id: str) -> bool:
         """
@@ -244,8 +416,5 @@ class MyoMyoAI:
         Returns:
             성공 여부
         """
-        with self._lock:
-            if game_id in self.game_histories:
-                del self.game_histories[game_id]
-                return True
-            return False
\ No newline at end of file
+        self.line_bank.forget_game(game_id)
+        return self.game_histories.pop(game_id, None) is not None
\ No newline at end of file
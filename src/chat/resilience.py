@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import config
+
+T = TypeVar('T')
+
+
+class CircuitOpenError(Exception):
+    """upstream 장애로 circuit 이 열려 호출하지 않음"""
+
+
+class LatencyTracker:
+    """
+    최근 window 개 호출의 지연 시간으로 백분위수 계산
+    """
+
+    def __init__(self, window: int = config.LLM_LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * p / 100))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold 에 도달하면 open 되어 reset_timeout 동안 호출을 막고,
+    그 후 시험 요청 1개(half-open)가 성공하면 다시 closed 로 돌아감.
+    """
+
+    def __init__(self, failure_threshold: int = config.LLM_BREAKER_FAILURES, reset_timeout: float = config.LLM_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        시험 요청이 결과 없이 취소된 경우 다음 요청이 시험할 수 있도록 해제
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+class EndpointPolicy:
+    """
+    엔드포인트 하나의 지연 예산 / hedged request / circuit breaker
+    """
+
+    def __init__(self, name: str, budget: float):
+        self.name = name
+        self.budget = budget
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker()
+        self._calls = 0
+        self._hedges = 0
+        self._timeouts = 0
+        self._rejected = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        두 번째 요청을 보낼 시점 (표본이 부족하면 hedge 하지 않음)
+        """
+        if len(self.latency) < config.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(config.LLM_HEDGE_PERCENTILE)
+
+    async def call(self, make_call: Callable[[], Awaitable[T]], budget: Optional[float] = None) -> T:
+        """
+        make_call() 을 지연 예산 안에서 실행
+        응답이 hedge 기준 시간을 넘으면 같은 요청을 한 번 더 보내 먼저 끝난 결과를 사용함.
+
+        Raises:
+            CircuitOpenError: circuit 이 열려 있는 경우 (즉시)
+            asyncio.TimeoutError: 지연 예산 초과
+        """
+        if not self.breaker.allow():
+            self._rejected += 1
+            raise CircuitOpenError(f"LLM circuit open: {self.name}")
+
+        self._calls += 1
+        budget = budget or self.budget
+        start = time.perf_counter()
+        deadline = start + budget
+        tasks = {asyncio.ensure_future(make_call())}
+        started = list(tasks)
+
+        try:
+            hedge_delay = self.hedge_delay()
+            if hedge_delay is not None and hedge_delay < budget:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    self._hedges += 1
+                    hedge = asyncio.ensure_future(make_call())
+                    tasks.add(hedge)
+                    started.append(hedge)
+
+            last_error: Optional[BaseException] = None
+            while tasks:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, tasks = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.latency.record(time.perf_counter() - start)
+                        self.breaker.record_success()
+                        return task.result()
+                    last_error = task.exception()
+
+            self.breaker.record_failure()
+            if tasks or last_error is None:
+                self._timeouts += 1
+                # 예산을 넘긴 호출도 지연 분포에 반영해야 hedge 기준이 낮게 굳지 않음
+                self.latency.record(budget)
+                raise asyncio.TimeoutError(f"LLM call exceeded {budget:.1f}s budget: {self.name}")
+            raise last_error
+
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            # 진 쪽 요청의 예외도 회수해야 "Task exception was never retrieved" 가 남지 않음
+            await asyncio.gather(*started, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            "budget_s": self.budget,
+            "calls": self._calls,
+            "hedges": self._hedges,
+            "timeouts": self._timeouts,
+            "rejected": self._rejected,
+            "p50_s": self.latency.percentile(50),
+            "p95_s": self.latency.percentile(95),
+            "breaker": self.breaker.state,
+        }
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import config
+
+
+class TaskPool:
+    """
+    루루 그림 과제({keyword, situation})를 백그라운드에서 미리 생성해 두는 풀
+    남은 과제가 low_water 미만이 되면 size 까지 비동기로 다시 채움.
+
+    producer 는 제외할 키워드 목록을 받아 새 과제 dict 를 반환하는 coroutine 함수.
+    """
+
+    def __init__(
+        self,
+        producer: Callable[[List[str]], Awaitable[Dict]],
+        used_keywords: Callable[[], List[str]],
+        size: int = config.LULU_TASK_POOL_SIZE,
+        low_water: int = config.LULU_TASK_POOL_LOW_WATER,
+        refill_concurrency: int = config.LULU_TASK_POOL_REFILL_CONCURRENCY,
+    ):
+        self.producer = producer
+        self.used_keywords = used_keywords
+        self.size = size
+        self.low_water = low_water
+        self.refill_concurrency = refill_concurrency
+        self._tasks = deque()
+        self._refill_task: Optional[asyncio.Task] = None
+
+        # metrics
+        self._served = 0
+        self._misses = 0
+        self._discarded = 0
+        self._produced = 0
+        self._failed = 0
+        self._produce_latency_total = 0.0
+        self._last_refill_latency = 0.0
+
+    def take(self) -> Optional[Dict]:
+        """
+        전역 사용 키워드와 겹치지 않는 과제 하나를 꺼냄 (없으면 None)
+        """
+        used = set(self.used_keywords())
+        task = None
+        while self._tasks:
+            candidate = self._tasks.popleft()
+            if candidate['keyword'] in used:
+                # 풀에 있는 동안 다른 경로로 같은 키워드가 사용됨
+                self._discarded += 1
+                continue
+            task = candidate
+            break
+
+        if task is None:
+            self._misses += 1
+        else:
+            self._served += 1
+        self.refill()
+        return task
+
+    def refill(self) -> None:
+        """
+        남은 과제가 low_water 미만이면 백그라운드 채우기 시작 (이벤트 루프 위에서 호출)
+        """
+        if len(self._tasks) >= self.low_water:
+            return
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        self._refill_task = asyncio.get_running_loop().create_task(self._refill())
+
+    async def _refill(self) -> None:
+        start = time.perf_counter()
+        while len(self._tasks) < self.size:
+            count = min(self.refill_concurrency, self.size - len(self._tasks))
+            exclude = list(self.used_keywords()) + [task['keyword'] for task in self._tasks]
+            results = await asyncio.gather(*(self._produce(exclude) for _ in range(count)))
+
+            produced = [task for task in results if task is not None]
+            if not produced:
+                # LLM 장애 시 재시도 폭주를 막기 위해 이번 채우기는 중단
+                break
+            added = 0
+            for task in produced:
+                pooled = {t['keyword'] for t in self._tasks}
+                if task['keyword'] in pooled or task['keyword'] in self.used_keywords():
+                    self._discarded += 1
+                    continue
+                self._tasks.append(task)
+                added += 1
+            if not added:
+                # 이미 쓰인 키워드만 계속 나오면 LLM 호출만 반복되므로 이번 채우기는 중단
+                break
+        self._last_refill_latency = time.perf_counter() - start
+
+    async def _produce(self, exclude: List[str]) -> Optional[Dict]:
+        start = time.perf_counter()
+        try:
+            task = await self.producer(exclude)
+        except Exception as e:
+            self._failed += 1
+            logging.error(f"그림 과제 사전 생성 실패: {e}")
+            return None
+        self._produced += 1
+        self._produce_latency_total += time.perf_counter() - start
+        return task
+
+    def stats(self) -> Dict:
+        return {
+            "depth": len(self._tasks),
+            "size": self.size,
+            "low_water": self.low_water,
+            "refilling": self._refill_task is not None and not self._refill_task.done(),
+            "served": self._served,
+            "misses": self._misses,
+            "discarded": self._discarded,
+            "produced": self._produced,
+            "failed": self._failed,
+            "avg_produce_latency_s": self._produce_latency_total / self._produced if self._produced else 0.0,
+            "last_refill_latency_s": self._last_refill_latency,
+        }
+
+    async def close(self) -> None:
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            self._refill_task = None
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from src.image.executor import InferenceBusyError, InferenceExecutor
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 요청을 잠깐(max_wait_ms) 모으거나 max_batch_size 에 도달하면
+    batch_fn 을 한 번만 실행하고 결과를 각 요청자에게 나눠줌.
+
+    batch_fn 은 입력 리스트를 받아 같은 길이의 결과 리스트를 반환해야 함.
+    대기열에 max_queue 개가 쌓여 있으면 새 요청은 바로 InferenceBusyError 로 거절됨.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        executor: InferenceExecutor,
+        stage: str,
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_queue: int,
+    ):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.stage = stage
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+
+        self._queue = deque()  # (item, future, enqueued_at)
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._running = set()  # 실행 중인 배치 task (GC 방지)
+
+        # metrics
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._batch_size_hist: Dict[int, int] = {}
+        self._queue_delay_total = 0.0
+        self._queue_delay_max = 0.0
+        self._rejected = 0
+
+    async def submit(self, item: Any) -> Any:
+        """
+        요청 하나를 배치 대기열에 넣고 결과를 기다림
+
+        Raises:
+            InferenceBusyError: 대기열이 가득 찬 경우
+        """
+        if len(self._queue) >= self.max_queue:
+            self._rejected += 1
+            raise InferenceBusyError(f"Batch queue is full: {self.stage}")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future, time.perf_counter()))
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._collect())
+        self._wakeup.set()
+
+        return await future
+
+    async def _collect(self) -> None:
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # 가장 오래된 요청 기준으로 최대 max_wait 만큼만 기다림
+            deadline = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch_size))]
+            # 추론이 도는 동안 다음 배치를 계속 모을 수 있도록 별도 task 로 실행
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List) -> None:
+        started = time.perf_counter()
+        self._record(len(batch), [started - enqueued_at for _, _, enqueued_at in batch])
+
+        items = [item for item, _, _ in batch]
+        try:
+            results = await self.executor.run(self.stage, self.batch_fn, items)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _record(self, size: int, delays: List[float]) -> None:
+        self._batches += 1
+        self._items += size
+        self._max_batch = max(self._max_batch, size)
+        self._batch_size_hist[size] = self._batch_size_hist.get(size, 0) + 1
+        self._queue_delay_total += sum(delays)
+        self._queue_delay_max = max(self._queue_delay_max, max(delays))
+
+    def stats(self) -> Dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "rejected": self._rejected,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "max_batch_size_seen": self._max_batch,
+            "batch_size_histogram": dict(sorted(self._batch_size_hist.items())),
+            "avg_queue_delay_ms": self._queue_delay_total / self._items * 1000 if self._items else 0.0,
+            "max_queue_delay_ms": self._queue_delay_max * 1000,
+        }
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
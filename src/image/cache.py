@@ -0,0 +1,127 @@
+import hashlib
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+import config
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    캐시 항목의 대략적인 메모리 크기(bytes)
+    """
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, (bytes, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ('created_at', 'fields', 'nbytes')
+
+    def __init__(self):
+        self.created_at = time.monotonic()
+        self.fields: Dict[str, Any] = {}
+        self.nbytes = 0
+
+
+class ResultCache:
+    """
+    이미지 내용(bytes)의 해시를 키로 하는 LRU 캐시
+    하나의 이미지에 대해 디코딩 이미지 / 마스킹 이미지 / 모델별 결과를 필드로 저장하여,
+    같은 이미지에 대한 반복 요청이나 classify + caption 요청이 이미 한 작업을 건너뛰도록 함.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = config.RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = config.RESULT_CACHE_MAX_BYTES,
+        ttl: float = config.RESULT_CACHE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str, field: str) -> Optional[Any]:
+        """
+        캐시 조회 (없거나 만료되었으면 None)
+
+        Args:
+            key: 이미지 해시
+            field: 'image', 'masked', 'classify', 'caption' 등
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created_at > self.ttl:
+                self._remove(key)
+                entry = None
+
+            if entry is None or field not in entry.fields:
+                self._misses[field] = self._misses.get(field, 0) + 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits[field] = self._hits.get(field, 0) + 1
+            return entry.fields[field]
+
+    def put(self, key: str, field: str, value: Any) -> None:
+        size = _estimate_size(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+            elif field in entry.fields:
+                old = _estimate_size(entry.fields[field])
+                entry.nbytes -= old
+                self._total_bytes -= old
+
+            entry.fields[field] = value
+            entry.nbytes += size
+            self._total_bytes += size
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.nbytes
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": dict(self._hits),
+                "misses": dict(self._misses),
+                "evictions": self._evictions,
+            }
+
+
+# 프로세스 전역 결과 캐시
+result_cache = ResultCache()
@@ -4,32 +4,95 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import logging
-from torchvision import transforms as T
+from torchvision.transforms import functional as TF
 from torchvision.models import efficientnet_b0
 import glob
+import numpy as np
 import os
+import hashlib
+from threading import Lock, Thread
+from typing import Tuple
+from PIL import Image
+from src.image import strokes
+from src.image.model import CNNModel
+from src.image.model_manager import model_manager
+from src.image.classifier_backends import build_checked_backend, set_threads
 
 # EfficientNet에 맞는 이미지 전처리 (ImageNet 표준)
-encode_image = T.Compose([
-        T.Resize(256),
-        T.CenterCrop(224),
-        T.RandomHorizontalFlip(),
-        T.RandomRotation(10),
-        T.ToTensor(),
-        T.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
-    ])
-
-# 최신 모델 파일 찾기
-pattern = os.path.join(config.MODEL_PATH, "*.pth")
-file_list = glob.glob(pattern)
-latest_file = max(file_list, key=os.path.getctime)
-
-logging.info("EfficientNet 모델 로딩 중...")
+# 서빙 시에는 학습용 augmentation(RandomFlip/Rotation) 없이 결정적으로 처리함
+RESIZE_SIZE = 256
+CROP_SIZE = 224
+MEAN = torch.tensor([0.485, 0.456, 0.406]).view(1, 3, 1, 1)
+STD = torch.tensor([0.229, 0.224, 0.225]).view(1, 3, 1, 1)
+
+# TTA(test-time augmentation) 시 사용할 회전 각도
+TTA_ROTATIONS = (10, -10)
+
+
+def to_uint8_tensor(image) -> torch.Tensor:
+    """
+    PIL Image 를 (3, H, W) uint8 tensor 로 변환 (PIL 재변환 없이 한 번만 복사)
+    """
+    if isinstance(image, torch.Tensor):
+        return image
+    return torch.from_numpy(np.array(image.convert('RGB'), dtype=np.uint8)).permute(2, 0, 1)
+
+
+def resize_crop(tensor: torch.Tensor) -> torch.Tensor:
+    """
+    uint8 tensor 를 Resize(256) + CenterCrop(224) 로 한 번에 변환
+    """
+    tensor = TF.resize(tensor, RESIZE_SIZE, antialias=True)
+    return TF.center_crop(tensor, [CROP_SIZE, CROP_SIZE])
+
+
+def normalize(batch: torch.Tensor) -> torch.Tensor:
+    """
+    (N, 3, 224, 224) uint8 배치를 한 번에 float 변환 + 정규화
+    """
+    return batch.float().div_(255).sub_(MEAN).div_(STD)
+
+
+def encode_batch(images) -> torch.Tensor:
+    """
+    이미지 리스트를 (N, 3, 224, 224) 정규화 tensor 로 변환
+    """
+    return normalize(torch.stack([resize_crop(to_uint8_tensor(image)) for image in images]))
+
+
+def encode_image(image) -> torch.Tensor:
+    """
+    단일 이미지를 (3, 224, 224) 정규화 tensor 로 변환
+    """
+    return encode_batch([image])[0]
+
+
+def tta_views(batch: torch.Tensor) -> torch.Tensor:
+    """
+    (N, 3, 224, 224) uint8 배치를 원본 / 좌우반전 / 회전 view 로 확장
+
+    Returns:
+        (N * V, 3, 224, 224) tensor, 이미지 i 의 view 들은 [i*V, (i+1)*V) 에 위치
+    """
+    views = [batch, TF.hflip(batch)] + [TF.rotate(batch, angle) for angle in TTA_ROTATIONS]
+    return torch.stack(views, dim=1).flatten(0, 1)
+
+
 device = "cuda" if torch.cuda.is_available() else "cpu"
 
+
+def latest_checkpoint(model_path: str = config.MODEL_PATH) -> str:
+    """
+    model_path 에서 가장 최근에 생성된 체크포인트 경로 반환
+    """
+    pattern = os.path.join(model_path, "*.pth")
+    file_list = glob.glob(pattern)
+    return max(file_list, key=os.path.getctime)
+
+
 # EfficientNet 모델 생성 및 로드
-def load_efficientnet_model(model_path, num_classes):
-    """EfficientNet 모델 로드"""
+def load_efficientnet_model(model_path, num_classes, fallback: bool = True):
+    """EfficientNet 모델 로드 (fallback=False 면 로드 실패 시 예외를 그대로 발생)"""
     try:
         # 저장된 모델 정보 로드
         checkpoint = torch.load(model_path, map_location=device)
@@ -55,6 +118,8 @@ def load_efficientnet_model(model_path, num_classes):
         
     except Exception as e:
         logging.error(f"EfficientNet 모델 로드 실패: {e}")
+        if not fallback:
+            raise
         # 대안: 기본 EfficientNet 모델 생성 (사전 훈련된 가중치 사용)
         logging.info("기본 EfficientNet 모델로 대체...")
         model = efficientnet_b0(weights='IMAGENET1K_V1')
@@ -62,55 +127,295 @@ def load_efficientnet_model(model_path, num_classes):
         model.classifier[1] = nn.Linear(num_ftrs, num_classes)
         return model
 
-# 모델 로드
-model = load_efficientnet_model(latest_file, len(config.DEMO_CATEGORIES))
-model.to(device)
-model.eval()  # 평가 모드
-logging.info("EfficientNet 모델 로드 완료!")
+def checkpoint_info(path: str) -> dict:
+    """
+    체크포인트 파일의 경로 / sha256 / 생성 시각
+    """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return {"path": path, "sha256": sha.hexdigest(), "ctime": os.path.getctime(path)}
 
-def classify(image):
+
+def synthetic_sketches(size: int, seed: int = 0) -> torch.Tensor:
+    """
+    흰 배경에 무작위 획을 그린 (N, 3, 224, 224) uint8 합성 스케치
+    실제 샘플이 없을 때 배경/선 분포만이라도 서빙 입력과 비슷하게 맞추기 위해 사용함
+    """
+    rng = np.random.default_rng(seed)
+    canvases = []
+    for _ in range(size):
+        sketch = []
+        for _ in range(rng.integers(2, 7)):
+            # 부드러운 획이 되도록 무작위 이동량을 누적
+            points = np.cumsum(rng.normal(0, 20, size=(rng.integers(2, 9), 2)), axis=0) + rng.uniform(40, 216, size=2)
+            sketch.append([points[:, 0].clip(0, 255).tolist(), points[:, 1].clip(0, 255).tolist()])
+        canvases.append(strokes.rasterize(sketch, 256, 256))
+    return torch.stack([resize_crop(canvas) for canvas in canvases])
+
+
+def calibration_batch(size: int = config.CLASSIFIER_CALIBRATION_SIZE) -> Tuple[torch.Tensor, bool]:
+    """
+    backend 일치율 검사 / int8 calibration 용 (N, 3, 224, 224) 정규화 입력
+    CLASSIFIER_CALIBRATION_DIR 의 샘플 이미지를 사용하고, 없으면 합성 스케치를 사용함
+
+    Returns:
+        (입력, 실제 샘플 여부)
+    """
+    paths = []
+    if config.CLASSIFIER_CALIBRATION_DIR:
+        paths = sorted(
+            p for p in glob.glob(os.path.join(config.CLASSIFIER_CALIBRATION_DIR, '*'))
+            if p.lower().endswith(('.png', '.jpg', '.jpeg'))
+        )[:size]
+    if paths:
+        return encode_batch([Image.open(p) for p in paths]), True
+    return normalize(synthetic_sketches(size)), False
+
+
+def _load_model(fallback: bool = True):
+    path = latest_checkpoint()
+    start = time.perf_counter()
+    set_threads()
+    model = load_efficientnet_model(path, len(config.DEMO_CATEGORIES), fallback=fallback)
+    model.to(device)
+    model.eval()  # 평가 모드
+    example, real_samples = calibration_batch()
+    backend = build_checked_backend(config.CLASSIFIER_BACKEND, model, example.to(device), real_samples)
+    backend.checkpoint_info = dict(checkpoint_info(path), load_time_s=time.perf_counter() - start)
+    return backend
+
+
+def _warmup(model):
+    """
+    합성 입력으로 한 번 추론하여 첫 요청의 지연(메모리 할당, 커널 선택 등)을 미리 처리
+    """
+    with torch.no_grad():
+        model(torch.zeros(1, 3, CROP_SIZE, CROP_SIZE, device=device))
+
+
+# 모델은 import 시점이 아니라 처음 필요할 때(또는 preload 시) 로드됨
+model_manager.register(
+    'classifier', _load_model, _warmup,
+    describe=lambda backend: {"checkpoint": backend.checkpoint_info, "backend": backend.kind, "parity": backend.parity},
+)
+
+
+def _load_tiny_model():
+    """
+    cascade 첫 단계의 작은 CNN (CASCADE_MODEL_PATH 의 최신 체크포인트)
+    """
+    checkpoint = torch.load(latest_checkpoint(config.CASCADE_MODEL_PATH), map_location=device)
+    model = CNNModel(len(config.DEMO_CATEGORIES))
+    model.load_state_dict(checkpoint.get('model_state_dict', checkpoint))
+    model.to(device)
+    model.eval()
+    return model
+
+
+def _warmup_tiny(model):
+    width, height = config.IMAGE_SIZE
+    with torch.no_grad():
+        model(torch.zeros(1, 3, height, width, device=device))
+
+
+model_manager.register('classifier_tiny', _load_tiny_model, _warmup_tiny)
+
+
+def reload_checkpoint(force: bool = False) -> dict:
+    """
+    MODEL_PATH 의 최신 체크포인트를 shadow 모델로 로드 + warm-up 한 뒤 교체
+    교체 전까지(그리고 교체 시점에 이미 실행 중인 요청은 끝날 때까지) 기존 모델로 계속 처리하며,
+    새 체크포인트 로드에 실패하면 기존 모델을 유지함.
+
+    Args:
+        force: 최신 체크포인트가 현재 모델과 같아도 다시 로드
+
+    Returns:
+        dict: 사용 중인 체크포인트 정보 (path, sha256, ctime, load_time_s)
+              모델이 로드되지 않았으면 다음 로드 시 사용할 체크포인트 경로만 반환 (로드하지 않음)
+    """
+    # peek 은 마지막 사용 시각을 갱신하지 않으므로 주기적인 확인이 유휴 모델 내리기를 막지 않음
+    current = model_manager.peek('classifier')
+    if current is None:
+        return {"path": latest_checkpoint(), "loaded": False}
+    active = current.checkpoint_info
+    path = latest_checkpoint()
+    if not force and path == active['path'] and os.path.getctime(path) == active['ctime']:
+        return active
+    logging.info(f"새 체크포인트로 교체: {path}")
+    return model_manager.reload('classifier', lambda: _load_model(fallback=False)).checkpoint_info
+
+
+_watcher = None
+
+
+def _watch_checkpoints(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            reload_checkpoint()
+        except Exception as e:
+            logging.error(f"체크포인트 교체 실패: {e}")
+
+
+def start_checkpoint_watcher(interval: float = config.CLASSIFIER_WATCH_INTERVAL) -> None:
+    """
+    interval 마다 MODEL_PATH 에 새 체크포인트가 있는지 확인하여 교체하는 데몬 스레드 시작
+    """
+    global _watcher
+    if not interval or (_watcher is not None and _watcher.is_alive()):
+        return
+    _watcher = Thread(target=_watch_checkpoints, args=(interval,), name="checkpoint-watcher", daemon=True)
+    _watcher.start()
+
+
+def classify(image, tta: bool = False):
     """
     이미지를 분류하고 상위 3개 예측 결과를 반환
     
     Args:
         image: PIL Image 객체
+        tta: True 면 augmentation view 들의 평균 확률로 예측 (느리지만 조금 더 정확)
         
     Returns:
         list: 상위 3개 예측 결과 (클래스명, 신뢰도 포함)
     """
-    try:
-        # 이미지 전처리
-        image_tensor = encode_image(image).unsqueeze(0).to(device)
-        
-        o1 = time.time()
-        logging.info("EfficientNet 모델 예측중 ....")
-        
-        with torch.no_grad():
-            outputs = model(image_tensor)  # 모델 추론
-            probabilities = F.softmax(outputs, dim=1)  # 확률 변환
-            top3_prob, top3_indices = torch.topk(probabilities, 3)  # 상위 3개 예측 가져오기
-        
-        o2 = time.time()
-        logging.info(f"EfficientNet 모델 예측 걸린 시간 : {o2-o1:.2f}초.")
+    return classify_batch([image], tta=tta)[0]
+
+
+def efficientnet_probabilities(crops: torch.Tensor, tta: bool = False) -> torch.Tensor:
+    """
+    (N, 3, 224, 224) uint8 배치의 EfficientNet 클래스 확률 (N, num_classes)
+    """
+    num_views = 1
+    if tta:
+        num_views = 2 + len(TTA_ROTATIONS)
+        crops = tta_views(crops)
+    image_tensor = normalize(crops).to(device)
 
-        # 결과 반환 (기존 형식과 동일)
+    with torch.no_grad(), model_manager.use('classifier') as model:
+        outputs = model(image_tensor)  # 모델 추론
+        probabilities = F.softmax(outputs, dim=1)  # 확률 변환
+        return probabilities.view(-1, num_views, probabilities.shape[-1]).mean(dim=1)  # view 평균
+
+
+def tiny_probabilities(crops: torch.Tensor) -> torch.Tensor:
+    """
+    (N, 3, 224, 224) uint8 배치의 작은 CNN 클래스 확률 (N, num_classes)
+    EfficientNet 과 같은 crop 을 IMAGE_SIZE 로 줄여 [0, 1] 범위로 입력함
+    """
+    width, height = config.IMAGE_SIZE
+    batch = TF.resize(crops, [height, width], antialias=True).float().div_(255).to(device)
+    with torch.no_grad(), model_manager.use('classifier_tiny') as model:
+        return model(batch).exp()  # LogSoftmax 출력
+
+
+def top3(probabilities: torch.Tensor):
+    """
+    클래스 확률을 이미지별 상위 3개 예측 결과 리스트로 변환
+    """
+    top3_prob, top3_indices = torch.topk(probabilities, 3)  # 상위 3개 예측 가져오기
+    batch_results = []
+    for b in range(len(probabilities)):
         results = []
         for i in range(3):
-            class_idx = top3_indices[0][i].item()
-            confidence = top3_prob[0][i].item() * 100
-            
+            class_idx = top3_indices[b][i].item()
+            confidence = top3_prob[b][i].item() * 100
+
             results.append({
                 'predicted': config.DEMO_CATEGORIES[class_idx],
                 'confidence': confidence
             })
-        
-        return results
+        batch_results.append(results)
+    return batch_results
+
+
+# cascade 단계별 통계
+_cascade_lock = Lock()
+_cascade_stats = {"images": 0, "tiny_accepted": 0, "escalated": 0, "tiny_errors": 0, "tiny_time_s": 0.0, "full_time_s": 0.0}
+
+
+def _cascade(crops: torch.Tensor):
+    """
+    작은 CNN 으로 먼저 분류하고, top-1 신뢰도가 CASCADE_THRESHOLD 미만인 이미지만 EfficientNet 으로 다시 분류
+    """
+    results = [None] * len(crops)
+    tiny_time = 0.0
+    try:
+        start = time.perf_counter()
+        for i, result in enumerate(top3(tiny_probabilities(crops))):
+            if result[0]['confidence'] >= config.CASCADE_THRESHOLD:
+                results[i] = result
+        tiny_time = time.perf_counter() - start
+        tiny_error = 0
+    except Exception as e:
+        logging.error(f"작은 CNN 분류 실패, EfficientNet 으로 분류: {e}")
+        tiny_error = 1
+
+    escalate = [i for i, result in enumerate(results) if result is None]
+    full_time = 0.0
+    if escalate:
+        start = time.perf_counter()
+        for i, result in zip(escalate, top3(efficientnet_probabilities(crops[escalate]))):
+            results[i] = result
+        full_time = time.perf_counter() - start
+
+    with _cascade_lock:
+        _cascade_stats["images"] += len(crops)
+        _cascade_stats["tiny_accepted"] += len(crops) - len(escalate)
+        _cascade_stats["escalated"] += len(escalate)
+        _cascade_stats["tiny_errors"] += tiny_error
+        _cascade_stats["tiny_time_s"] += tiny_time
+        _cascade_stats["full_time_s"] += full_time
+    return results
+
+
+def cascade_stats():
+    with _cascade_lock:
+        stats = dict(_cascade_stats)
+    images = stats["images"]
+    stats["enabled"] = config.CASCADE_ENABLED
+    stats["threshold"] = config.CASCADE_THRESHOLD
+    stats["tiny_hit_rate"] = stats["tiny_accepted"] / images if images else 0.0
+    return stats
+
+
+def classify_batch(images, tta: bool = False):
+    """
+    여러 이미지를 한 번의 forward 로 분류
+    CASCADE_ENABLED 이면 (TTA 가 아닐 때) 작은 CNN 을 먼저 실행하고 애매한 이미지만 EfficientNet 으로 분류함
+
+    Args:
+        images: PIL Image 객체 리스트
+        tta: True 면 모든 이미지의 augmentation view 를 하나의 배치로 묶어 추론
+
+    Returns:
+        list: 이미지별 상위 3개 예측 결과 리스트 (입력 순서와 동일)
+    """
+    try:
+        # 이미지 전처리
+        crops = torch.stack([resize_crop(to_uint8_tensor(image)) for image in images])
+
+        o1 = time.time()
+        logging.info(f"EfficientNet 모델 예측중 .... (batch={len(images)})")
+
+        if config.CASCADE_ENABLED and not tta:
+            batch_results = _cascade(crops)
+        else:
+            batch_results = top3(efficientnet_probabilities(crops, tta=tta))
+
+        o2 = time.time()
+        logging.info(f"EfficientNet 모델 예측 걸린 시간 : {o2-o1:.2f}초.")
+
+        return batch_results
         
     except Exception as e:
         logging.error(f"분류 중 오류 발생: {e}")
         # 오류 발생 시 기본값 반환
-        return [
+        return [[
             {'predicted': 'unknown', 'confidence': 0.0},
             {'predicted': 'unknown', 'confidence': 0.0},
             {'predicted': 'unknown', 'confidence': 0.0}
-        ]
\ No newline at end of file
+        ] for _ in images]
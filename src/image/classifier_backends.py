@@ -0,0 +1,172 @@
+import copy
+import io
+import logging
+from typing import Callable, Dict, Optional
+
+import torch
+import torch.nn as nn
+
+import config
+
+BACKENDS = ('eager', 'channels_last', 'torchscript', 'int8_dynamic', 'int8_static', 'onnx')
+
+
+class Backend:
+    """
+    분류 모델 추론 backend
+    (N, 3, H, W) 정규화 float tensor 를 받아 (N, num_classes) logits tensor 를 반환하는 callable.
+    """
+
+    def __init__(self, kind: str, model, forward: Optional[Callable[[torch.Tensor], torch.Tensor]] = None):
+        self.kind = kind
+        self.model = model  # 변환된 모듈 (onnx 는 InferenceSession)
+        self._forward = forward or model
+
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor:
+        return self._forward(batch)
+
+
+def set_threads(threads: Optional[int] = config.CLASSIFIER_INTRA_OP_THREADS) -> None:
+    """
+    현재 워커(프로세스)의 torch intra-op 스레드 수 설정
+    """
+    if threads:
+        torch.set_num_threads(threads)
+
+
+def _channels_last(model: nn.Module, example: torch.Tensor) -> Backend:
+    model = model.to(memory_format=torch.channels_last)
+    return Backend('channels_last', model, lambda batch: model(batch.contiguous(memory_format=torch.channels_last)))
+
+
+def _torchscript(model: nn.Module, example: torch.Tensor) -> Backend:
+    with torch.no_grad():
+        scripted = torch.jit.freeze(torch.jit.trace(model, example))
+        scripted = torch.jit.optimize_for_inference(scripted)
+    return Backend('torchscript', scripted)
+
+
+def _int8_dynamic(model: nn.Module, example: torch.Tensor) -> Backend:
+    # dynamic 양자화는 Linear 레이어만 대상 (conv 는 float 유지)
+    quantized = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    return Backend('int8_dynamic', quantized)
+
+
+def _int8_static(model: nn.Module, example: torch.Tensor) -> Backend:
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    prepared = prepare_fx(model, get_default_qconfig_mapping('x86'), (example,))
+    with torch.no_grad():
+        for batch in example.split(8):  # 관측 범위 보정(calibration)
+            prepared(batch)
+    return Backend('int8_static', convert_fx(prepared))
+
+
+def _onnx(model: nn.Module, example: torch.Tensor) -> Backend:
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise RuntimeError("onnx backend requires the onnxruntime package") from e
+
+    buffer = io.BytesIO()
+    torch.onnx.export(
+        model, example[:1], buffer,
+        input_names=['input'], output_names=['logits'],
+        dynamic_axes={'input': {0: 'batch'}, 'logits': {0: 'batch'}},
+    )
+    options = ort.SessionOptions()
+    if config.CLASSIFIER_INTRA_OP_THREADS:
+        options.intra_op_num_threads = config.CLASSIFIER_INTRA_OP_THREADS
+    session = ort.InferenceSession(buffer.getvalue(), options, providers=['CPUExecutionProvider'])
+
+    def forward(batch: torch.Tensor) -> torch.Tensor:
+        logits, = session.run(None, {'input': batch.cpu().numpy()})
+        return torch.from_numpy(logits)
+
+    return Backend('onnx', session, forward)
+
+
+_BUILDERS = {
+    'channels_last': _channels_last,
+    'torchscript': _torchscript,
+    'int8_dynamic': _int8_dynamic,
+    'int8_static': _int8_static,
+    'onnx': _onnx,
+}
+
+
+def build_backend(kind: str, model: nn.Module, example: torch.Tensor) -> Backend:
+    """
+    eager 모델로부터 backend 생성 (eager 모델은 변경하지 않음)
+
+    Args:
+        kind: BACKENDS 중 하나
+        model: eval 모드의 eager 모델
+        example: 변환 / calibration 에 사용할 (N, 3, H, W) 정규화 입력
+    """
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend: {kind}")
+    if kind == 'eager':
+        return Backend('eager', model)
+    return _BUILDERS[kind](copy.deepcopy(model), example)
+
+
+def top3_parity(reference: Callable, backend: Callable, inputs: torch.Tensor) -> Dict:
+    """
+    eager 모델 대비 backend 의 top-3 일치율
+
+    Returns:
+        dict: top1 (top-1 일치 비율), top3 (top-3 집합 일치 비율)
+    """
+    with torch.no_grad():
+        expected = torch.topk(reference(inputs), 3).indices
+        actual = torch.topk(backend(inputs), 3).indices
+    top1 = (expected[:, 0] == actual[:, 0]).float().mean().item()
+    top3 = sum(set(e.tolist()) == set(a.tolist()) for e, a in zip(expected, actual)) / len(inputs)
+    return {"top1": top1, "top3": top3}
+
+
+def build_checked_backend(kind: str, model: nn.Module, example: torch.Tensor, real_samples: bool = True) -> Backend:
+    """
+    backend 를 만들고 eager top-3 와 비교하여, 일치율이 CLASSIFIER_PARITY_MIN 미만이거나
+    생성에 실패하면 eager backend 를 반환함. 결과는 backend.parity 에 기록됨.
+
+    real_samples 가 False(합성 스케치)이면 int8_static 은 calibration 범위를 믿을 수 없어 사용하지 않고,
+    나머지 backend 는 일치율 검사 결과가 실제 입력을 대표하지 못한다고 경고함.
+    """
+    if kind == 'eager':
+        backend = build_backend(kind, model, example)
+        backend.parity = {"top1": 1.0, "top3": 1.0}
+        return backend
+
+    if kind == 'int8_static' and not real_samples:
+        logging.error("int8_static 은 실제 calibration 샘플(CLASSIFIER_CALIBRATION_DIR)이 필요합니다, eager 로 대체")
+        backend = build_backend('eager', model, example)
+        backend.parity = {"top1": 1.0, "top3": 1.0, "fallback_from": kind, "error": "no calibration samples"}
+        return backend
+
+    try:
+        backend = build_backend(kind, model, example)
+        parity = top3_parity(model, backend, example)
+    except Exception as e:
+        logging.error(f"분류 backend 생성 실패 ({kind}), eager 로 대체: {e}")
+        backend = build_backend('eager', model, example)
+        backend.parity = {"top1": 1.0, "top3": 1.0, "fallback_from": kind, "error": str(e)}
+        return backend
+
+    if parity['top1'] < config.CLASSIFIER_PARITY_MIN:
+        logging.error(f"분류 backend 정확도 불일치 ({kind}: {parity}), eager 로 대체")
+        backend = build_backend('eager', model, example)
+        backend.parity = dict(parity, fallback_from=kind)
+        return backend
+
+    if not real_samples:
+        logging.warning(
+            f"분류 backend {kind} 의 일치율을 합성 스케치로만 검사했습니다. "
+            f"CLASSIFIER_CALIBRATION_DIR 에 실제 샘플을 두어야 검사 결과를 신뢰할 수 있습니다"
+        )
+        parity = dict(parity, synthetic=True)
+    backend.parity = parity
+    logging.info(f"분류 backend: {kind} (eager 대비 {parity})")
+    return backend
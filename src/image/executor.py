@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import config
+
+
+class InferenceBusyError(Exception):
+    """단계별 대기열이 가득 차 요청을 받을 수 없음"""
+
+
+def _init_worker():
+    """
+    프로세스 풀 워커 초기화
+    워커 프로세스가 모델을 소유하도록 시작 시점에 PRELOAD_MODELS 를 로드 + warm-up 하고,
+    워커마다 새 분류 모델 체크포인트를 감시함
+    """
+    from src.image import classifier, img_caption, text_masking  # noqa: F401
+    classifier.start_checkpoint_watcher()
+    from src.image.model_manager import model_manager
+    for name in config.PRELOAD_MODELS:
+        try:
+            model_manager.load(name)
+        except Exception:
+            pass  # 상태는 'failed' 로 기록되고 요청 시 다시 로드를 시도함
+
+
+def _model_status() -> Dict[str, Dict]:
+    from src.image.model_manager import model_manager
+    return model_manager.status()
+
+
+class InferenceExecutor:
+    """
+    CPU 연산(OCR 마스킹, 분류, 캡셔닝)을 이벤트 루프 밖의 전용 풀에서 실행
+    단계(stage)별로 동시 실행 수와 대기열 길이를 제한함.
+    """
+
+    def __init__(
+        self,
+        kind: str = config.INFERENCE_EXECUTOR,
+        max_workers: int = config.INFERENCE_MAX_WORKERS,
+        stage_concurrency: Dict[str, int] = config.INFERENCE_STAGE_CONCURRENCY,
+        max_queue: int = config.INFERENCE_MAX_QUEUE,
+    ):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.stage_concurrency = dict(stage_concurrency)
+        self._semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in self.stage_concurrency.items()}
+        self._pending = {stage: 0 for stage in self.stage_concurrency}
+        self._pool: Executor = None
+        self._last_model_status: Dict[str, Dict] = {}
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == 'process':
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='inference')
+            logging.info(f"추론 실행기 생성: {self.kind} x {self.max_workers}")
+        return self._pool
+
+    async def run(self, stage: str, fn: Callable, *args, **kwargs):
+        """
+        fn(*args, **kwargs) 를 풀에서 실행하고 결과를 기다림
+
+        Args:
+            stage: 단계 이름 ('mask', 'classify', 'caption')
+            fn: 실행할 함수 (프로세스 풀 사용 시 모듈 최상위 함수여야 함)
+
+        Raises:
+            InferenceBusyError: 해당 단계의 대기열이 가득 찬 경우
+        """
+        if stage not in self._semaphores:
+            raise ValueError(f"Unknown inference stage: {stage}")
+
+        if self._pending[stage] >= self.stage_concurrency[stage] + self.max_queue:
+            raise InferenceBusyError(f"Inference queue is full: {stage}")
+
+        self._pending[stage] += 1
+        try:
+            async with self._semaphores[stage]:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args, **kwargs))
+        finally:
+            self._pending[stage] -= 1
+
+    def preload_models(self, names: List[str]) -> None:
+        """
+        모델을 백그라운드에서 미리 로드 + warm-up
+        프로세스 풀이면 워커들을 미리 띄워 각 워커의 initializer 가 로드하도록 함
+        """
+        if self.kind == 'process':
+            pool = self._get_pool()
+            for _ in range(self.max_workers):
+                pool.submit(_model_status)
+        else:
+            from src.image.model_manager import model_manager
+            model_manager.preload(names)
+
+    async def model_status(self, timeout: float = 1.0) -> Dict[str, Dict]:
+        """
+        모델을 실제로 소유한 쪽(스레드 풀이면 현재 프로세스, 프로세스 풀이면 워커)의 모델 상태
+        워커가 바빠 timeout 안에 응답하지 못하면 마지막으로 확인한 상태를 반환함.
+        """
+        if self.kind != 'process':
+            return _model_status()
+        loop = asyncio.get_running_loop()
+        try:
+            self._last_model_status = await asyncio.wait_for(
+                loop.run_in_executor(self._get_pool(), _model_status), timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+        return self._last_model_status
+
+    def stats(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "pending": dict(self._pending),
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# 프로세스 전역 추론 실행기
+executor = InferenceExecutor()
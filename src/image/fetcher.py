@@ -0,0 +1,92 @@
+import asyncio
+from typing import Optional
+
+import aiohttp
+import config
+
+
+class ImageFetchError(Exception):
+    """이미지 다운로드 실패 (HTTP 오류, 시간 초과, 크기 초과 등)"""
+
+
+class ImageFetcher:
+    """
+    비동기 이미지 다운로더
+    프로세스 전역에서 하나의 커넥션 풀(keep-alive)을 공유하며,
+    호스트별 커넥션 수 / 제한 시간 / 최대 다운로드 크기를 강제함.
+    """
+
+    def __init__(
+        self,
+        timeout: float = config.FETCH_TIMEOUT,
+        connect_timeout: float = config.FETCH_CONNECT_TIMEOUT,
+        max_bytes: int = config.FETCH_MAX_BYTES,
+        max_connections: int = config.FETCH_MAX_CONNECTIONS,
+        max_connections_per_host: int = config.FETCH_MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout: float = config.FETCH_KEEPALIVE_TIMEOUT,
+    ):
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout)
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        커넥션 풀은 이벤트 루프 위에서만 생성할 수 있으므로 첫 요청 시 생성
+        """
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    connector = aiohttp.TCPConnector(
+                        limit=self.max_connections,
+                        limit_per_host=self.max_connections_per_host,
+                        keepalive_timeout=self.keepalive_timeout,
+                    )
+                    self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        URL의 이미지를 다운로드
+
+        Args:
+            url: 이미지 URL (S3)
+
+        Returns:
+            bytes: 이미지 데이터
+
+        Raises:
+            ImageFetchError: HTTP 오류, 시간 초과, 최대 크기 초과
+        """
+        session = await self._get_session()
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+
+                if response.content_length is not None and response.content_length > self.max_bytes:
+                    raise ImageFetchError(f"Image too large: {response.content_length} bytes")
+
+                # Content-Length 를 신뢰하지 않고 읽는 도중에도 크기 제한 확인
+                chunks = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    chunks.extend(chunk)
+                    if len(chunks) > self.max_bytes:
+                        raise ImageFetchError(f"Image too large: exceeds {self.max_bytes} bytes")
+                return bytes(chunks)
+
+        except asyncio.TimeoutError:
+            raise ImageFetchError(f"Image download timed out: {url}")
+        except aiohttp.ClientError as e:
+            raise ImageFetchError(str(e))
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# 프로세스 전역 fetcher
+fetcher = ImageFetcher()
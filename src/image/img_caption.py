@@ -1,20 +1,156 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
 from transformers import BlipProcessor, BlipForConditionalGeneration
 from PIL import Image
 import torch
+import torch.nn as nn
 
+import config
+from src.image.model_manager import model_manager
 
-print('BLIP 모델 로딩중....')
-processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-print('BLIP 모델 로딩완료!')
+CAPTION_MODEL = "Salesforce/blip-image-captioning-base"
 
 
+class EncoderCache:
+    """
+    이미지 해시별 vision encoder 출력 LRU 캐시
+    같은 이미지를 다시 캡셔닝할 때 encoder 를 건너뛰고 decoder 만 실행함.
+    """
 
-def get_caption(image: Image) -> str:
-    inputs = processor(images=image, return_tensors="pt")
+    def __init__(self, max_entries: int = config.CAPTION_ENCODER_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Optional[str]) -> Optional[torch.Tensor]:
+        if key is None or not self.max_entries:
+            return None
+        with self._lock:
+            embeds = self._entries.get(key)
+            if embeds is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return embeds
+
+    def put(self, key: Optional[str], embeds: torch.Tensor) -> None:
+        if key is None or not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = embeds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+_encoder_cache = EncoderCache()
+
+
+def _load_model():
+    processor = BlipProcessor.from_pretrained(CAPTION_MODEL)
+    model = BlipForConditionalGeneration.from_pretrained(CAPTION_MODEL)
+    if config.CAPTION_DTYPE == 'bf16':
+        model = model.to(torch.bfloat16)
+    elif config.CAPTION_DTYPE == 'int8':
+        model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    elif config.CAPTION_DTYPE != 'fp32':
+        raise ValueError(f"Unknown caption dtype: {config.CAPTION_DTYPE}")
+    model.eval()
+    _encoder_cache.clear()
+    return processor, model
+
+
+def _warmup(loaded):
+    _generate(loaded, [Image.new('RGB', (384, 384), 'white')], [None], max_new_tokens=5)
+
+
+# 모델은 import 시점이 아니라 처음 필요할 때(또는 preload 시) 로드됨
+model_manager.register('caption', _load_model, _warmup)
+
+
+def _generate(loaded, images: List[Image.Image], keys: List[Optional[str]], max_new_tokens: int = config.CAPTION_MAX_NEW_TOKENS) -> List[str]:
+    """
+    이미지들을 한 번의 generate 로 캡셔닝
+    캐시에 없는 이미지만 vision encoder 를 실행하고, 전체 encoder 출력으로 text decoder 를 실행함.
+    """
+    processor, model = loaded
+    embeds: List[Optional[torch.Tensor]] = [_encoder_cache.get(key) for key in keys]
+
+    missing = [i for i, e in enumerate(embeds) if e is None]
+    if missing:
+        pixel_values = processor(images=[images[i] for i in missing], return_tensors="pt").pixel_values
+        with torch.no_grad():
+            encoded = model.vision_model(pixel_values=pixel_values.to(model.dtype))[0]
+        for i, e in zip(missing, encoded):
+            embeds[i] = e
+            # e 는 배치 전체 tensor 의 view 이므로 복사해서 저장 (캐시 항목 하나가 배치 전체 메모리를 붙잡지 않도록)
+            _encoder_cache.put(keys[i], e.clone())
+
+    image_embeds = torch.stack(embeds)
+    text_config = model.config.text_config
+    input_ids = torch.full((len(images), 1), text_config.bos_token_id, dtype=torch.long)
 
     with torch.no_grad():
-        output_ids = model.generate(**inputs)
-    caption = processor.decode(output_ids[0], skip_special_tokens=True)
+        output_ids = model.text_decoder.generate(
+            input_ids=input_ids,
+            eos_token_id=text_config.sep_token_id,
+            pad_token_id=text_config.pad_token_id,
+            encoder_hidden_states=image_embeds,
+            encoder_attention_mask=torch.ones(image_embeds.shape[:-1], dtype=torch.long),
+            max_new_tokens=max_new_tokens,
+            num_beams=config.CAPTION_NUM_BEAMS,
+            early_stopping=config.CAPTION_EARLY_STOPPING if config.CAPTION_NUM_BEAMS > 1 else False,
+            do_sample=False,
+        )
+    return [caption.strip() for caption in processor.batch_decode(output_ids, skip_special_tokens=True)]
+
+
+def caption_batch(items: List[Tuple[Optional[str], Image.Image]]) -> List[str]:
+    """
+    여러 이미지를 한 번의 generate 로 캡셔닝
+
+    Args:
+        items: (이미지 해시, PIL Image) 리스트, 해시가 같은 이미지는 encoder 출력을 재사용함 (None 이면 재사용 안 함)
+
+    Returns:
+        list: 이미지별 캡션 (입력 순서와 동일)
+    """
+    # 같은 배치 안의 중복 이미지는 한 번만 생성
+    unique: Dict[object, int] = {}
+    images, keys, index = [], [], []
+    for key, image in items:
+        dedup = key if key is not None else id(image)
+        if dedup not in unique:
+            unique[dedup] = len(images)
+            images.append(image)
+            keys.append(key)
+        index.append(unique[dedup])
+
+    with model_manager.use('caption') as loaded:
+        captions = _generate(loaded, images, keys)
+    return [captions[i] for i in index]
+
+
+def get_caption(image: Image) -> str:
+    return caption_batch([(None, image)])[0]
+
 
-    return caption
\ No newline at end of file
+def encoder_cache_stats() -> Dict:
+    return _encoder_cache.stats()
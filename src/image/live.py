@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import torch
+
+import config
+from src.image.executor import InferenceBusyError
+from src.image.strokes import Canvas
+
+# 전체 세션 통계
+_stats = {"deltas": 0, "inferences": 0, "skipped_small_change": 0, "skipped_busy": 0, "errors": 0, "pushed": 0}
+
+
+class LiveSession:
+    """
+    게임 하나의 실시간 추측 세션
+    획 조각을 받아 캔버스에 이어 그리고, 입력이 잠시 멈추거나(debounce) 일정 시간이 지나면 분류하되
+    마지막 분류 이후 바뀐 픽셀이 적으면 분류를 생략함. 상위 k 개 클래스가 바뀔 때만 결과를 내보냄.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        debounce_ms: float = config.LIVE_DEBOUNCE_MS,
+        max_interval_ms: float = config.LIVE_MAX_INTERVAL_MS,
+        min_changed_pixels: int = config.LIVE_MIN_CHANGED_PIXELS,
+        top_k: int = config.LIVE_TOP_K,
+    ):
+        self.canvas = Canvas(width, height)
+        self.debounce = debounce_ms / 1000
+        self.max_interval = max_interval_ms / 1000
+        self.min_changed_pixels = min_changed_pixels
+        self.top_k = top_k
+        self._changed = 0  # 마지막 분류 이후 새로 칠해진 픽셀 수
+        self._last_labels: Optional[List[str]] = None
+        self._dirty = asyncio.Event()
+        # 현재 이 세션을 사용 중인 연결 (WebSocket, 결과 전송 task), 같은 게임으로 새로 접속하면 교체됨
+        self.websocket: Optional[Any] = None
+        self.pusher: Optional[asyncio.Task] = None
+
+    async def apply(self, message: Dict) -> None:
+        """
+        클라이언트 메시지 반영 (래스터화는 event loop 밖의 thread 에서 실행)
+            {"type": "strokes", "strokes": [[[x...], [y...]], ...], "continues": false}
+            {"type": "clear"}
+
+        Raises:
+            ValueError: 알 수 없는 메시지 / 잘못된 획 데이터
+        """
+        kind = message.get("type")
+        if kind == "strokes":
+            self._changed += await asyncio.to_thread(
+                self.canvas.add, message.get("strokes", []), bool(message.get("continues"))
+            )
+            _stats["deltas"] += 1
+        elif kind == "clear":
+            self.canvas.clear()
+            self._changed = 0
+            self._last_labels = None
+        else:
+            raise ValueError(f"Unknown message type: {kind}")
+        self._dirty.set()
+
+    async def _settle(self) -> None:
+        """
+        입력이 debounce 동안 멈추거나 첫 입력 후 max_interval 이 지날 때까지 대기
+        """
+        await self._dirty.wait()
+        deadline = time.monotonic() + self.max_interval
+        while True:
+            self._dirty.clear()
+            remaining = min(self.debounce, deadline - time.monotonic())
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._dirty.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    async def guesses(self, classify: Callable[[torch.Tensor], Awaitable[List[Dict]]]) -> AsyncIterator[List[Dict]]:
+        """
+        캔버스가 충분히 바뀔 때마다 분류하여, 상위 k 개 클래스가 바뀐 경우에만 결과를 내보냄
+
+        Args:
+            classify: (3, H, W) uint8 tensor 를 받아 상위 예측 리스트를 반환하는 coroutine 함수
+        """
+        while True:
+            await self._settle()
+            if self._changed < self.min_changed_pixels:
+                _stats["skipped_small_change"] += 1
+                continue
+
+            changed, self._changed = self._changed, 0
+            try:
+                result = await classify(self.canvas.tensor())
+            except InferenceBusyError:
+                # 다음 입력 때 다시 시도
+                self._changed += changed
+                _stats["skipped_busy"] += 1
+                continue
+            except Exception as e:
+                # 한 번의 분류 실패로 세션 전체의 추측을 멈추지 않음
+                logging.error(f"실시간 추측 분류 실패: {e}")
+                _stats["errors"] += 1
+                continue
+            _stats["inferences"] += 1
+
+            top = result[:self.top_k]
+            labels = [prediction['predicted'] for prediction in top]
+            if labels == self._last_labels or labels[0] == 'unknown':
+                continue
+            self._last_labels = labels
+            _stats["pushed"] += 1
+            yield top
+
+
+def live_stats() -> Dict:
+    return dict(_stats)
@@ -0,0 +1,348 @@
+import gc
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import torch
+
+import config
+
+
+def model_footprint(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    모델 객체의 대략적인 메모리 사용량(bytes)
+    torch 모듈의 parameter / buffer 크기를 합산하며, tuple 이나 일반 객체(easyocr.Reader 등)는
+    속성으로 가진 torch 모듈까지 따라감.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, torch.nn.Module):
+        tensors = list(obj.parameters()) + list(obj.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    if isinstance(obj, (tuple, list)):
+        return sum(model_footprint(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        return sum(
+            model_footprint(value, seen) for value in vars(obj).values()
+            if isinstance(value, (torch.nn.Module, tuple, list))
+        )
+    return 0
+
+
+class ModelManager:
+    """
+    모델 지연(lazy) 로딩 / 병렬 사전 로딩 / 메모리 예산 관리자
+    모델은 import 시점이 아니라 처음 필요할 때(또는 preload 시) 로드되고,
+    로드 직후 합성 입력으로 warm-up 추론을 한 번 실행한 뒤 ready 상태가 됨.
+    같은 모델을 동시에 여러 번 로드하지 않도록 모델별 lock 으로 보호함(single-flight).
+
+    모델별 메모리 사용량과 마지막 사용 시각을 기록하여, idle_ttl 동안 쓰이지 않았거나
+    전체 사용량이 memory_budget_mb 를 넘으면 사용 중이 아닌 모델을 오래된 것부터 내림.
+    내린 모델은 다음 요청 시 다시 로드됨.
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: Optional[float] = config.MODEL_MEMORY_BUDGET_MB,
+        idle_ttl: Optional[float] = config.MODEL_IDLE_TTL,
+        sweep_interval: float = config.MODEL_SWEEP_INTERVAL,
+    ):
+        self.memory_budget_mb = memory_budget_mb
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._models: Dict[str, Any] = {}
+        self._status: Dict[str, Dict] = {}
+        self._describes: Dict[str, Optional[Callable[[Any], Dict]]] = {}
+        self._locks: Dict[str, Lock] = {}
+        self._reload_locks: Dict[str, Lock] = {}
+        self._registry_lock = Lock()  # _footprint / _last_used / _in_use 보호
+        self._footprint: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._in_use: Dict[str, int] = {}
+        self._loads: Dict[str, int] = {}
+        self._unloads: Dict[str, int] = {}
+        self._preload_pool: Optional[ThreadPoolExecutor] = None
+        self._stop = Event()
+        self._sweeper: Optional[Thread] = None
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], None]] = None,
+        describe: Optional[Callable[[Any], Dict]] = None,
+    ) -> None:
+        """
+        Args:
+            name: 모델 이름
+            loader: 모델을 생성하여 반환하는 함수
+            warmup: 로드된 모델로 합성 입력 추론을 실행하는 함수
+            describe: 로드된 모델의 추가 정보(체크포인트 등)를 상태에 표시할 dict 로 반환하는 함수
+        """
+        self._loaders[name] = loader
+        self._warmups[name] = warmup
+        self._describes[name] = describe
+        self._locks.setdefault(name, Lock())
+        self._reload_locks.setdefault(name, Lock())
+        self._status.setdefault(name, {"state": "not_loaded"})
+        self._loads.setdefault(name, 0)
+        self._unloads.setdefault(name, 0)
+        self._in_use.setdefault(name, 0)
+
+    def get(self, name: str) -> Any:
+        """
+        모델 반환 (로드되지 않았으면 현재 스레드에서 로드)
+        반환된 모델을 오래 사용하는 동안 내려가지 않게 하려면 use() 를 사용
+        """
+        model = self._models.get(name)
+        if model is None:
+            model = self.load(name)
+        self._last_used[name] = time.monotonic()
+        return model
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """
+        사용하는 동안 내려가지 않도록 모델을 고정(pin)하고 반환
+        """
+        with self._registry_lock:
+            self._in_use[name] += 1
+        try:
+            yield self.get(name)
+        finally:
+            with self._registry_lock:
+                self._in_use[name] -= 1
+                self._last_used[name] = time.monotonic()
+
+    def peek(self, name: str) -> Optional[Any]:
+        """
+        로드된 모델 반환 (로드되지 않았으면 None, 로드하거나 마지막 사용 시각을 갱신하지 않음)
+        """
+        return self._models.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def load(self, name: str) -> Any:
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+
+            try:
+                self._status[name] = {"state": "loading"}
+                logging.info(f"[{name}] 모델 로딩 중...")
+                model, timings = self._build(name, self._loaders[name])
+            except Exception as e:
+                logging.error(f"[{name}] 모델 로드 실패: {e}")
+                self._status[name] = {"state": "failed", "error": str(e)}
+                raise
+
+            self._install(name, model, timings)
+            logging.info(f"[{name}] 모델 로드 완료! (load {timings['load_time_s']:.2f}s, warm-up {timings['warmup_time_s']:.2f}s)")
+
+        self.enforce_budget(keep=name)
+        return model
+
+    def reload(self, name: str, loader: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        새 모델을 shadow 로 로드 + warm-up 한 뒤 원자적으로 교체
+        교체 전까지 기존 모델로 계속 처리하고, 이미 기존 모델을 사용 중인 요청은 기존 모델로 끝남.
+        로드 / warm-up 에 실패하면 기존 모델을 유지하고 예외를 발생시킴.
+
+        Args:
+            loader: 이번 교체에만 사용할 로더 (기본값은 등록된 로더)
+
+        Returns:
+            교체된 새 모델
+        """
+        with self._reload_locks[name]:  # 동시에 하나의 교체만 진행
+            status = self._status[name]
+            status["reloading"] = True
+            try:
+                logging.info(f"[{name}] 교체할 모델 로딩 중...")
+                model, timings = self._build(name, loader or self._loaders[name])
+            except Exception as e:
+                logging.error(f"[{name}] 모델 교체 실패: {e}")
+                status.pop("reloading", None)
+                status["reload_error"] = str(e)
+                raise
+
+            with self._locks[name]:  # 진행 중인 일반 로드가 끝난 뒤 교체
+                self._install(name, model, timings)
+            logging.info(f"[{name}] 모델 교체 완료! (load {timings['load_time_s']:.2f}s, warm-up {timings['warmup_time_s']:.2f}s)")
+
+        gc.collect()
+        self.enforce_budget(keep=name)
+        return model
+
+    def _build(self, name: str, loader: Callable[[], Any]):
+        start = time.perf_counter()
+        model = loader()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self._warmups[name] is not None:
+            self._warmups[name](model)
+        warmup_time = time.perf_counter() - start
+        return model, {"load_time_s": load_time, "warmup_time_s": warmup_time}
+
+    def _install(self, name: str, model: Any, timings: Dict) -> None:
+        """
+        모델을 사용 가능한 상태로 등록 (기존 모델이 있으면 교체)
+        """
+        info = self._describes[name](model) if self._describes[name] is not None else {}
+        with self._registry_lock:
+            self._models[name] = model
+            self._footprint[name] = model_footprint(model)
+            self._last_used[name] = time.monotonic()
+            self._loads[name] += 1
+        self._status[name] = {"state": "ready", **timings, **info}
+
+    def unload(self, name: str) -> bool:
+        """
+        사용 중이 아닌 모델을 내림
+
+        Returns:
+            bool: 내렸으면 True (로드되지 않았거나 사용 중이면 False)
+        """
+        with self._locks[name]:
+            with self._registry_lock:
+                if name not in self._models or self._in_use[name] > 0:
+                    return False
+                del self._models[name]
+                self._footprint.pop(name, None)
+                self._unloads[name] += 1
+            self._status[name] = {"state": "unloaded"}
+
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logging.info(f"[{name}] 모델 내림")
+        return True
+
+    def memory_bytes(self) -> int:
+        with self._registry_lock:
+            return sum(self._footprint.values())
+
+    def enforce_budget(self, keep: Optional[str] = None) -> List[str]:
+        """
+        전체 사용량이 memory_budget_mb 이하가 될 때까지 오래 사용되지 않은 모델부터 내림
+
+        Args:
+            keep: 내리지 않을 모델 (방금 로드한 모델)
+
+        Returns:
+            list: 내린 모델 이름
+        """
+        if not self.memory_budget_mb:
+            return []
+        budget = self.memory_budget_mb * 1024 * 1024
+        with self._registry_lock:
+            candidates = sorted(
+                (name for name in self._models if name != keep and self._in_use[name] == 0),
+                key=lambda name: self._last_used.get(name, 0.0),
+            )
+
+        unloaded = []
+        for name in candidates:
+            if self.memory_bytes() <= budget:
+                break
+            if self.unload(name):
+                unloaded.append(name)
+        return unloaded
+
+    def sweep(self) -> List[str]:
+        """
+        idle_ttl 동안 사용되지 않은 모델을 내림
+
+        Returns:
+            list: 내린 모델 이름
+        """
+        if not self.idle_ttl:
+            return []
+        deadline = time.monotonic() - self.idle_ttl
+        with self._registry_lock:
+            idle = [name for name in self._models if self._last_used.get(name, 0.0) < deadline]
+        return [name for name in idle if self.unload(name)]
+
+    def start_sweeper(self) -> None:
+        """
+        sweep_interval 마다 sweep 을 실행하는 데몬 스레드 시작 (idle_ttl 이 없으면 시작하지 않음)
+        """
+        if not self.idle_ttl:
+            return
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+        self._sweeper = Thread(target=self._run_sweeper, name="model-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logging.error(f"유휴 모델 정리 중 오류 발생: {e}")
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+
+    def preload(self, names: List[str]) -> None:
+        """
+        모델들을 백그라운드 스레드에서 병렬로 로드 + warm-up (기다리지 않음)
+        """
+        names = [name for name in names if name in self._loaders]
+        if not names:
+            return
+        if self._preload_pool is None:
+            self._preload_pool = ThreadPoolExecutor(max_workers=len(self._loaders), thread_name_prefix='model-loader')
+        for name in names:
+            self._status[name] = {"state": "queued"}
+            self._preload_pool.submit(self._preload_one, name)
+
+    def _preload_one(self, name: str) -> None:
+        try:
+            self.load(name)
+        except Exception:
+            pass  # 상태는 load 에서 'failed' 로 기록됨
+
+    def status(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        result = {}
+        with self._registry_lock:
+            for name, status in self._status.items():
+                result[name] = dict(
+                    status,
+                    footprint_mb=self._footprint.get(name, 0) / (1024 * 1024),
+                    idle_s=now - self._last_used[name] if name in self._last_used else None,
+                    in_use=self._in_use.get(name, 0),
+                    loads=self._loads.get(name, 0),
+                    unloads=self._unloads.get(name, 0),
+                )
+        return result
+
+    def is_ready(self, names: List[str], status: Optional[Dict[str, Dict]] = None) -> bool:
+        """
+        모델들이 모두 요청을 처리할 수 있는 상태인지 (유휴로 내린 모델은 요청 시 다시 로드되므로 포함)
+
+        Args:
+            status: 판단할 모델 상태 (프로세스 풀 워커의 status() 결과 등), 없으면 현재 프로세스의 상태
+        """
+        status = self._status if status is None else status
+        return all(status.get(name, {}).get("state") in ("ready", "unloaded") for name in names)
+
+
+# 프로세스 전역 모델 관리자
+model_manager = ModelManager()
+model_manager.start_sweeper()
@@ -2,12 +2,18 @@ import io
 from PIL import Image
 from src.image.text_masking import mask_text
 
+def decode(image_bytes: bytes) -> Image.Image:
+    """
+    이미지 bytes 를 PIL.Image(RGB)로 변환
+    """
+    return Image.open(io.BytesIO(image_bytes)).convert('RGB')
+
 def preproc(image_bytes: bytes):
     """
     이미지 전처리 함수
     1. PIL.Image로 변환
     2. 텍스트 검출 후 masking
     """
-    image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+    image = decode(image_bytes)
     masked_img = mask_text(image)
     return masked_img
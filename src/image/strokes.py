@@ -0,0 +1,214 @@
+import json
+from typing import List, Optional
+
+import numpy as np
+import torch
+from PIL import Image
+
+import config
+
+# QuickDraw 형식: 획(stroke) 리스트, 각 획은 [[x0, x1, ...], [y0, y1, ...]] (선택적으로 [t0, t1, ...] 포함)
+Strokes = List[List[List[float]]]
+
+
+def strokes_bytes(strokes: Strokes, width: Optional[float] = None, height: Optional[float] = None) -> bytes:
+    """
+    결과 캐시 키를 만들기 위한 획 데이터의 정규화된 bytes 표현 (시간 값은 제외)
+    """
+    points = [[list(stroke[0]), list(stroke[1])] for stroke in strokes]
+    return json.dumps([points, width, height], separators=(',', ':')).encode()
+
+
+def _segments(strokes: Strokes, max_points: int = config.STROKE_MAX_POINTS) -> np.ndarray:
+    """
+    획들을 (S, 4) 선분 배열 [x0, y0, x1, y1] 로 변환 (점 하나짜리 획은 길이 0 선분)
+    """
+    if sum(len(stroke[0]) for stroke in strokes if stroke) > max_points:
+        raise ValueError(f"too many points (max {max_points})")
+    segments = []
+    for stroke in strokes:
+        if len(stroke) < 2 or len(stroke[0]) != len(stroke[1]) or not stroke[0]:
+            raise ValueError("each stroke must be [[x...], [y...]] with equal, non-empty lengths")
+        points = np.stack([np.asarray(stroke[0], dtype=np.float32), np.asarray(stroke[1], dtype=np.float32)], axis=1)
+        if not np.isfinite(points).all():
+            raise ValueError("stroke coordinates must be finite")
+        if len(points) == 1:
+            points = np.repeat(points, 2, axis=0)
+        segments.append(np.concatenate([points[:-1], points[1:]], axis=1))
+    if not segments:
+        return np.zeros((0, 4), dtype=np.float32)
+    return np.concatenate(segments)
+
+
+def _fit(segments: np.ndarray, size: int, width: Optional[float], height: Optional[float]) -> np.ndarray:
+    """
+    선분 좌표를 캔버스 좌표로 변환
+    캔버스 크기가 주어지면 캔버스 전체를, 아니면 그림 영역(여백 포함)을 가운데 맞춤으로 축소/확대함
+    """
+    points = segments.reshape(-1, 2)
+    if width is not None or height is not None:
+        if width is None or height is None or not (np.isfinite([width, height]).all() and width > 0 and height > 0):
+            raise ValueError("width and height must be finite and positive")
+        origin = np.zeros(2, dtype=np.float32)
+        extent = np.array([width, height], dtype=np.float32)
+        margin = 0.0
+    else:
+        origin = points.min(axis=0)
+        extent = np.maximum(points.max(axis=0) - origin, 1.0)
+        margin = size * config.STROKE_MARGIN
+
+    scale = (size - 1 - 2 * margin) / extent.max()
+    offset = (size - 1 - extent * scale) / 2
+    return ((points - origin) * scale + offset).reshape(-1, 4)
+
+
+def _clip(segments: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    선분들을 [low, high] 정사각형 영역으로 자름 (Liang-Barsky), 영역과 겹치지 않는 선분은 버림
+    """
+    x0, y0, x1, y1 = segments.T
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = np.zeros(len(segments)), np.ones(len(segments))
+    keep = np.ones(len(segments), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, x0 - low), (dx, high - x0), (-dy, y0 - low), (dy, high - y0)):
+            r = q / p
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+            keep &= (p != 0) | (q >= 0)
+    keep &= t0 <= t1
+    t0, t1 = t0[keep, None], t1[keep, None]
+    start, delta = segments[keep, :2], segments[keep, 2:] - segments[keep, :2]
+    return np.concatenate([start + t0 * delta, start + t1 * delta], axis=1)
+
+
+def draw_segments(canvas: np.ndarray, segments: np.ndarray, line_width: int = config.STROKE_LINE_WIDTH) -> int:
+    """
+    캔버스 좌표의 선분들을 캔버스(흰 배경)에 검은 선으로 그림
+    선분을 캔버스 영역으로 자른 뒤 1px 간격으로 샘플링하고, 샘플 점마다 선 두께만큼의 원형 붓을 찍음
+    (획 단위 Python 루프 없이 STROKE_SAMPLE_CHUNK 개 샘플 단위로 처리하여 메모리 사용량을 제한함)
+
+    Returns:
+        int: 새로 칠해진 픽셀 수
+    """
+    size = canvas.shape[0]
+    radius = max(line_width - 1, 0) / 2
+    r = int(np.ceil(radius))
+    segments = _clip(segments, -r, size - 1 + r)
+    if not len(segments):
+        return 0
+    x0, y0, x1, y1 = segments.T
+    dx, dy = x1 - x0, y1 - y0
+
+    # 선분별 샘플 수 (길이 1px 당 1개 + 끝점), 잘린 선분은 캔버스 대각선보다 짧음
+    counts = np.minimum(np.ceil(np.hypot(dx, dy)).astype(np.int64), 2 * (size + 2 * r)) + 1
+
+    # 원형 붓
+    oy, ox = np.mgrid[-r:r + 1, -r:r + 1]
+    brush = ox ** 2 + oy ** 2 <= radius ** 2 + 0.5
+    ox, oy = ox[brush][None, :], oy[brush][None, :]
+
+    flat_canvas = canvas.reshape(-1)
+    changed = 0
+    bounds = np.searchsorted(np.cumsum(counts), np.arange(config.STROKE_SAMPLE_CHUNK, counts.sum(), config.STROKE_SAMPLE_CHUNK))
+    for part in np.split(np.arange(len(segments)), np.unique(bounds)):
+        if not len(part):
+            continue
+        part_counts = counts[part]
+        index = np.repeat(part, part_counts)
+        starts = np.repeat(np.cumsum(part_counts) - part_counts, part_counts)
+        t = (np.arange(part_counts.sum()) - starts) / np.maximum(counts[index] - 1, 1)
+        xs = np.rint(x0[index] + t * dx[index]).astype(np.int64)
+        ys = np.rint(y0[index] + t * dy[index]).astype(np.int64)
+
+        xs = (xs[:, None] + ox).ravel()
+        ys = (ys[:, None] + oy).ravel()
+        inside = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+        flat = np.unique(ys[inside] * size + xs[inside])
+        changed += int(np.count_nonzero(flat_canvas[flat]))
+        flat_canvas[flat] = 0
+    return changed
+
+
+def to_tensor(canvas: np.ndarray) -> torch.Tensor:
+    """
+    (H, W) uint8 캔버스를 (3, H, W) uint8 tensor 로 변환 (classifier 입력으로 바로 사용 가능)
+    """
+    return torch.from_numpy(canvas).unsqueeze(0).repeat(3, 1, 1)
+
+
+def rasterize(
+    strokes: Strokes,
+    width: Optional[float] = None,
+    height: Optional[float] = None,
+    size: int = config.STROKE_CANVAS_SIZE,
+    line_width: int = config.STROKE_LINE_WIDTH,
+) -> torch.Tensor:
+    """
+    QuickDraw 형식 획을 흰 배경에 검은 선으로 래스터화
+
+    Args:
+        strokes: 획 리스트 (좌표 단위는 자유)
+        width, height: 클라이언트 캔버스 크기 (없으면 그림 영역에 맞춤)
+
+    Returns:
+        (3, size, size) uint8 tensor
+    """
+    canvas = np.full((size, size), 255, dtype=np.uint8)
+    segments = _segments(strokes)
+    if len(segments):
+        draw_segments(canvas, _fit(segments, size, width, height), line_width)
+    return to_tensor(canvas)
+
+
+class Canvas:
+    """
+    획을 조금씩 추가하며 그리는 캔버스 (클라이언트 캔버스 크기 기준 좌표)
+    이어지는 획 조각(continues=True)은 직전 조각의 마지막 점과 연결됨.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        size: int = config.STROKE_CANVAS_SIZE,
+        line_width: int = config.STROKE_LINE_WIDTH,
+    ):
+        self.width = width
+        self.height = height
+        self.size = size
+        self.line_width = line_width
+        self.pixels = np.full((size, size), 255, dtype=np.uint8)
+        self._last_point: Optional[List[float]] = None
+
+    def add(self, strokes: Strokes, continues: bool = False) -> int:
+        """
+        Args:
+            strokes: 새로 그려진 획 (조각)
+            continues: 첫 획이 직전에 받은 획의 이어지는 부분인지
+
+        Returns:
+            int: 새로 칠해진 픽셀 수
+        """
+        strokes = [[list(stroke[0]), list(stroke[1])] for stroke in strokes]
+        if continues and strokes and self._last_point is not None:
+            strokes[0] = [[self._last_point[0], *strokes[0][0]], [self._last_point[1], *strokes[0][1]]]
+        segments = _segments(strokes)
+        if not len(segments):
+            return 0
+        self._last_point = [strokes[-1][0][-1], strokes[-1][1][-1]]
+        return draw_segments(self.pixels, _fit(segments, self.size, self.width, self.height), self.line_width)
+
+    def clear(self) -> None:
+        self.pixels.fill(255)
+        self._last_point = None
+
+    def tensor(self) -> torch.Tensor:
+        return to_tensor(self.pixels)
+
+
+def to_image(tensor: torch.Tensor) -> Image.Image:
+    """
+    (3, H, W) uint8 tensor 를 PIL Image(RGB)로 변환 (캡셔닝 입력용)
+    """
+    return Image.fromarray(tensor.permute(1, 2, 0).numpy())
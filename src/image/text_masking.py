@@ -1,10 +1,96 @@
 import io
-from PIL import Image, ImageDraw
+from threading import Lock
+from PIL import Image
 import config
+import cv2
 import easyocr
 import numpy as np
 
-reader = easyocr.Reader(['en', 'ko'])
+from src.image.model_manager import model_manager
+
+OCR_LANGS = ['en', 'ko']
+
+
+def _warmup(reader: easyocr.Reader) -> None:
+    reader.detect(np.full((64, 64, 3), 255, dtype=np.uint8))
+
+
+# 모드별 Reader ('detect' 모드는 인식 모델을 로드하지 않음), 처음 필요할 때(또는 preload 시) 로드됨
+model_manager.register('ocr_recognize', lambda: easyocr.Reader(OCR_LANGS, recognizer=True), _warmup)
+model_manager.register('ocr_detect', lambda: easyocr.Reader(OCR_LANGS, recognizer=False), _warmup)
+
+
+def reader_name(mode: str = None) -> str:
+    """
+    모드에 사용할 Reader 의 모델 이름
+    """
+    mode = mode or config.OCR_MODE
+    if mode not in ('recognize', 'detect'):
+        raise ValueError(f"Unknown OCR mode: {mode}")
+    if mode == 'detect' and model_manager.is_loaded('ocr_recognize'):
+        # 인식 모델이 이미 로드된 Reader 도 검출기는 그대로 사용할 수 있음
+        return 'ocr_recognize'
+    return f'ocr_{mode}'
+
+
+# OCR 사전 검사 통계
+_gate_lock = Lock()
+_gate_stats = {"checked": 0, "skipped": 0}
+
+
+def has_text_candidates(image: Image) -> bool:
+    """
+    OCR 전에 이미지에 글자가 있을 가능성이 있는지 빠르게 검사
+    연결 요소(connected component) 중 글자 크기/비율이고, 비슷한 높이의 이웃과
+    가로로 나란히 놓인 요소가 TEXT_GATE_MIN_GLYPHS 개 이상이면 글자 후보로 판단함.
+
+    Args: PIL Image(RGB)
+    Returns: 글자 후보가 있으면 True (False 면 OCR 을 생략해도 됨)
+    """
+    gray = np.asarray(image.convert('L'))
+    height, width = gray.shape
+    scale = min(1.0, config.TEXT_GATE_MAX_SIDE / max(height, width))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        height, width = gray.shape
+
+    ink = gray < 128
+    if ink.mean() > 0.5:  # 어두운 배경에 밝은 선
+        ink = ~ink
+    if not ink.any():
+        return False
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(ink.astype(np.uint8), connectivity=8)
+    x, y, w, h, area = stats[1:].T  # 0번은 배경
+
+    # 글자 크기의 요소만 (너무 작은 점 / 그림 전체를 덮는 큰 선 제외)
+    glyph = (h >= height * 0.01) & (h <= height * 0.25) & (w <= h * 3) & (area >= 4)
+    x, y, w, h = x[glyph], y[glyph], w[glyph], h[glyph]
+    if len(h) < config.TEXT_GATE_MIN_GLYPHS:
+        return False
+    if len(h) > 500:  # 요소가 매우 많으면 판단하지 않고 OCR 에 맡김
+        return True
+
+    # 비슷한 높이 + 같은 줄 + 가까운 간격의 이웃이 있는 요소 수 (pairwise, 벡터 연산)
+    cy = y + h / 2
+    similar_height = np.maximum(h[:, None], h[None, :]) <= 1.5 * np.minimum(h[:, None], h[None, :])
+    same_line = np.abs(cy[:, None] - cy[None, :]) <= 0.5 * np.maximum(h[:, None], h[None, :])
+    gap = np.maximum(x[:, None], x[None, :]) - np.minimum(x[:, None] + w[:, None], x[None, :] + w[None, :])
+    close = gap <= 2 * np.maximum(h[:, None], h[None, :])
+    neighbours = similar_height & same_line & close
+    np.fill_diagonal(neighbours, False)
+
+    return int(neighbours.any(axis=1).sum()) >= config.TEXT_GATE_MIN_GLYPHS
+
+
+def gate_stats() -> dict:
+    with _gate_lock:
+        return {
+            "enabled": config.TEXT_GATE_ENABLED,
+            "checked": _gate_stats["checked"],
+            "skipped": _gate_stats["skipped"],
+            "skip_ratio": _gate_stats["skipped"] / _gate_stats["checked"] if _gate_stats["checked"] else 0.0,
+        }
 
 def recog_text(image: Image):
     """
@@ -13,7 +99,8 @@ def recog_text(image: Image):
     """
     image_np = np.array(image)
 
-    results = reader.readtext(image_np)
+    with model_manager.use(reader_name('recognize')) as reader:
+        results = reader.readtext(image_np)
 
     filtered_boxes = [box for box, text, conf in results if conf >= config.TEXT_THRESHOLD]
 
@@ -23,19 +110,81 @@ def recog_text(image: Image):
     return filtered_boxes
 
 
+def detect_text(image: Image):
+    """
+    인식 모델 없이 검출기의 영역만으로 텍스트 박스 검출
+    Args: image
+    Returns: 검출 점수가 OCR_DETECT_THRESHOLD 이상인 영역의 4점 polygon 리스트
+    """
+    image_np = np.array(image)
+
+    with model_manager.use(reader_name('detect')) as reader:
+        horizontal_list, free_list = reader.detect(image_np, text_threshold=config.OCR_DETECT_THRESHOLD)
+
+    # 가로 박스 [x_min, x_max, y_min, y_max] 는 4점 polygon 으로 변환
+    boxes = [
+        [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+        for x_min, x_max, y_min, y_max in horizontal_list[0]
+    ]
+    boxes.extend(free_list[0])
+    return boxes
+
+
+def find_text_boxes(image: Image, mode: str = None, max_side: int = None):
+    """
+    최대 변 길이가 max_side 가 되도록 축소한 이미지에서 텍스트를 검출하고,
+    박스 좌표를 원본 이미지 좌표로 되돌려 반환
 
-def mask_text(image: Image):
+    Args: image, OCR 모드 ('recognize' | 'detect', 기본값 config.OCR_MODE),
+          OCR 최대 해상도 (기본값 config.OCR_MAX_SIDE, 0 이면 축소하지 않음)
+    Returns: 마스킹 할 텍스트 영역 polygon 리스트 (원본 좌표)
+    """
+    mode = mode or config.OCR_MODE
+    max_side = config.OCR_MAX_SIDE if max_side is None else max_side
+
+    scale = 1.0
+    if max_side > 0 and max(image.size) > max_side:
+        scale = max_side / max(image.size)
+        small = cv2.resize(
+            np.asarray(image),
+            (round(image.width * scale), round(image.height * scale)),
+            interpolation=cv2.INTER_AREA,
+        )
+        image = Image.fromarray(small)
+
+    boxes = detect_text(image) if mode == 'detect' else recog_text(image)
+    return [np.asarray(box, dtype=np.float32) / scale for box in boxes]
+
+
+def paint_boxes(image: Image, boxes):
     """
     Args: PIL Image(RGB), 바운딩 박스
+    Returns: 박스 영역을 흰색으로 칠한 이미지
+    """
+    masked = np.array(image)
+    if boxes:
+        # 여러 polygon 을 한 번에 채우면(fillPoly / drawContours) 겹친 영역이 even-odd 규칙으로 비워지므로 polygon 별로 채움
+        for box in boxes:
+            cv2.fillPoly(masked, [np.round(np.asarray(box, dtype=np.float32)).astype(np.int32)], (255, 255, 255))
+    return Image.fromarray(masked)
+
+
+def mask_text(image: Image, mode: str = None):
+    """
+    Args: PIL Image(RGB), OCR 모드 (기본값 config.OCR_MODE)
     Returns: 마스킹 된 이미지 데이터
     """
-    boxes = recog_text(image)
-    masked = image.copy()
-    draw = ImageDraw.Draw(masked)
-    for box in boxes:
-        box = [(int(point[0]), int(point[1])) for point in box]
-        draw.polygon(box, fill=(255, 255, 255))
-    return masked
+    if config.TEXT_GATE_ENABLED:
+        found = has_text_candidates(image)
+        with _gate_lock:
+            _gate_stats["checked"] += 1
+            if not found:
+                _gate_stats["skipped"] += 1
+        if not found:
+            return image.copy()
+
+    boxes = find_text_boxes(image, mode)
+    return paint_boxes(image, boxes)
 
 
 
@@ -3,6 +3,17 @@ from fastapi import FastAPI
 from src.api.image_routes import router as image_router
 from src.api.myomyo_routes import router as chat_router
 from src.api.lulu_routes import router as lulu_router
+from src.api.metrics_routes import router as metrics_router
+from src.api.health_routes import router as health_router
+from src.api.admin_routes import router as admin_router
+from src.api.image_routes import caption_batcher, classify_batcher
+from src.api.lulu_routes import lulu
+from src.api.myomyo_routes import myomyo
+import config
+from src.image.fetcher import fetcher
+from src.image.executor import executor
+from src.image import classifier
+from src.chat.llm import close_llm_clients
 app = FastAPI(
     title="Gotcha! AI Server",
     description="AI Server",
@@ -16,4 +27,37 @@ app.include_router(image_router, prefix='/api/v1')
 app.include_router(chat_router, prefix='/api/v1')
 
 
-app.include_router(lulu_router, prefix='/api/v1')
\ No newline at end of file
+app.include_router(lulu_router, prefix='/api/v1')
+
+
+app.include_router(metrics_router, prefix='/api/v1')
+
+
+app.include_router(admin_router, prefix='/api/v1')
+
+
+app.include_router(health_router)
+
+
+@app.on_event("startup")
+async def startup():
+    # 모델을 백그라운드에서 병렬로 로드 + warm-up (완료 여부는 /health/ready)
+    executor.preload_models(config.PRELOAD_MODELS)
+    # 새 분류 모델 체크포인트 감시 (프로세스 풀이면 워커가 각자 감시)
+    if executor.kind == 'thread':
+        classifier.start_checkpoint_watcher()
+    # 첫 요청 전에 루루 그림 과제 풀을 미리 채움
+    lulu.task_pool.refill()
+    # 묘묘 정형 이벤트 대사 뱅크를 백그라운드에서 채움
+    if config.MYOMYO_LINE_BANK_ENABLED and config.MYOMYO_LINE_BANK_WARMUP_ROUNDS:
+        myomyo.schedule_line_bank_fill(config.MYOMYO_LINE_BANK_WARMUP_ROUNDS)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await fetcher.close()
+    await classify_batcher.close()
+    await caption_batcher.close()
+    await lulu.task_pool.close()
+    executor.shutdown()
+    await close_llm_clients()
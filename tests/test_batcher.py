@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from src.image.batcher import MicroBatcher
+from src.image.executor import InferenceBusyError
+
+
+class InlineExecutor:
+    async def run(self, stage, fn, items):
+        return fn(items)
+
+
+def test_submit_rejects_when_queue_is_full():
+    async def run():
+        batcher = MicroBatcher(
+            batch_fn=lambda items: [item * 2 for item in items],
+            executor=InlineExecutor(),
+            stage='classify',
+            max_batch_size=8,
+            max_wait_ms=50,
+            max_queue=2,
+        )
+        accepted = [asyncio.ensure_future(batcher.submit(i)) for i in (1, 2)]
+        await asyncio.sleep(0)  # 두 요청이 대기열에 들어감
+        with pytest.raises(InferenceBusyError):
+            await batcher.submit(3)
+        results = await asyncio.gather(*accepted)
+        await batcher.close()
+        return batcher, results
+
+    batcher, results = asyncio.run(run())
+
+    assert results == [2, 4]
+    assert batcher.stats()["rejected"] == 1
+    assert batcher.stats()["queued"] == 0
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from src.chat.line_bank import LineBank, parse_lines
+
+
+@pytest.mark.parametrize('content', [
+    '{"첫 대사": 1, "둘째 대사": 2}',  # 객체: key 가 대사로 쓰이면 안 됨
+    '"한 줄짜리 대사"',  # 문자열: 글자마다 대사가 되면 안 됨
+    '["좋은 대사", 3]',
+    '["좋은 대사", "  "]',
+    '[]',
+    '대사 1, 대사 2',
+])
+def test_parse_lines_rejects_malformed_response(content):
+    with pytest.raises(ValueError):
+        parse_lines(content)
+
+
+def test_fill_keeps_existing_lines_on_malformed_response():
+    async def generator(prompt, count):
+        return parse_lines('{"이상한": "응답"}')
+
+    bank = LineBank(generator, variants=3, path=None)
+    key = LineBank.key("round_start", (1, 3))
+    bank._lines[key] = ["기존 대사"]
+
+    asyncio.run(bank.fill("round_start", (1, 3), "프롬프트"))
+
+    assert bank._lines[key] == ["기존 대사"]
+    assert bank.stats()["fills"] == 0
+
+
+def test_parse_lines_strips_lines():
+    assert parse_lines('[" 어디 한번 그려봐! ", "이번엔 내가 이긴다"]') == ["어디 한번 그려봐!", "이번엔 내가 이긴다"]
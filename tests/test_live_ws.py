@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+pytest.importorskip("transformers")
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.api import image_routes
+
+app = FastAPI()
+app.include_router(image_routes.router)
+
+
+def test_live_guess_survives_malformed_frames():
+    client = TestClient(app)
+    with client.websocket_connect("/image/live/malformed?width=100&height=100") as websocket:
+        for frame in ["not json", "[1, 2]", '"strokes"', '{"type": "unknown"}']:
+            websocket.send_text(frame)
+            assert websocket.receive_json()["type"] == "error"
+
+        # 잘못된 메시지 뒤에도 세션이 유지됨
+        websocket.send_json({"type": "clear"})
+        websocket.send_text("{")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"type": "end"})
+    assert "malformed" not in image_routes.live_sessions
+
+
+def test_live_guess_rejects_non_positive_canvas():
+    client = TestClient(app)
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/image/live/zero?width=0&height=100") as websocket:
+            websocket.receive_json()
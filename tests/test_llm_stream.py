@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+from src.chat.llm import LLMClient
+
+
+class FakeStream:
+    """
+    토큰을 끝없이 내보내는 OpenAI 스트림 대용
+    """
+
+    def __init__(self):
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="냥"))])
+
+    async def close(self):
+        self.closed = True
+
+
+def fake_client(stream):
+    async def create(**kwargs):
+        return stream
+
+    client = LLMClient(api_key="test", base_url="http://localhost:1", max_concurrency=1)
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client
+
+
+def test_chat_stream_releases_slot_when_consumer_disconnects():
+    async def run():
+        stream = FakeStream()
+        client = fake_client(stream)
+        async with contextlib.aclosing(client.chat_stream(messages=[], endpoint="myomyo")) as chunks:
+            async for _ in chunks:
+                assert client._semaphore.locked()
+                break  # 클라이언트가 첫 토큰 뒤에 끊음
+        return client, stream
+
+    client, stream = asyncio.run(run())
+
+    assert stream.closed
+    assert not client._semaphore.locked()
+    assert client.stats()["in_flight"] == 0
+
+
+def test_myomyo_stream_closes_llm_stream_on_disconnect():
+    from src.chat.myomyo import MyoMyoAI
+
+    async def run():
+        stream = FakeStream()
+        myomyo = MyoMyoAI(api_key="test")
+        myomyo.llm = fake_client(stream)
+        response = myomyo.generate_response_stream("disconnect-game", "그림을 맞춰봐")
+        async for _ in response:
+            break
+        await response.aclose()  # SSE 클라이언트 연결 종료
+        return myomyo, stream
+
+    myomyo, stream = asyncio.run(run())
+
+    assert stream.closed
+    assert not myomyo.llm._semaphore.locked()
+    assert myomyo.game_histories["disconnect-game"].messages()[-1] == {"role": "assistant", "content": "냥"}
+
+
+class BrokenStream(FakeStream):
+    async def __anext__(self):
+        raise ConnectionError("stream reset")
+
+
+class StalledStream(FakeStream):
+    async def __anext__(self):
+        await asyncio.sleep(10)
+
+
+def test_chat_stream_records_mid_stream_failure():
+    async def run():
+        stream = BrokenStream()
+        client = fake_client(stream)
+        with pytest.raises(ConnectionError):
+            async for _ in client.chat_stream(messages=[], endpoint="myomyo"):
+                pass
+        return client, stream
+
+    client, stream = asyncio.run(run())
+
+    assert stream.closed
+    assert not client._semaphore.locked()
+    assert client.policy("myomyo").breaker._failures == 1
+
+
+def test_chat_stream_records_stalled_stream_timeout():
+    async def consume(client):
+        async for _ in client.chat_stream(messages=[], endpoint="myomyo"):
+            pass
+
+    async def run():
+        stream = StalledStream()
+        client = fake_client(stream)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(consume(client), 0.05)
+        return client, stream
+
+    client, stream = asyncio.run(run())
+
+    assert stream.closed
+    assert not client._semaphore.locked()
+    assert client.policy("myomyo").breaker._failures == 1
+
+
+def test_chat_stream_consumer_disconnect_is_not_a_failure():
+    async def run():
+        client = fake_client(FakeStream())
+        async with contextlib.aclosing(client.chat_stream(messages=[], endpoint="myomyo")) as chunks:
+            async for _ in chunks:
+                break
+        return client
+
+    client = asyncio.run(run())
+
+    assert client.policy("myomyo").breaker._failures == 0
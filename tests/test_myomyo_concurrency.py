@@ -0,0 +1,72 @@
+import asyncio
+import random
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("openai")
+from src.chat.myomyo import MyoMyoAI
+
+
+class FakeLLM:
+    """
+    지연만 흉내 내고 마지막 메시지를 되돌려주며, 게임별 / 전체 동시 실행 수를 기록하는 fake LLM
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.active = Counter()
+        self.max_per_game = Counter()
+        self.total_active = 0
+        self.max_total = 0
+
+    async def chat(self, messages, timeout=None, **kwargs) -> str:
+        prompt = messages[-1]["content"]
+        game_id = prompt.split("#")[0]
+        self.active[game_id] += 1
+        self.total_active += 1
+        self.max_per_game[game_id] = max(self.max_per_game[game_id], self.active[game_id])
+        self.max_total = max(self.max_total, self.total_active)
+        try:
+            await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        finally:
+            self.active[game_id] -= 1
+            self.total_active -= 1
+        return "echo:" + prompt
+
+    def stats(self):
+        return {}
+
+
+def test_turns_are_serialized_per_game_and_parallel_across_games():
+    games, turns = 20, 5
+    game_ids = [f"concurrency-{g}" for g in range(games)]
+    myomyo = MyoMyoAI(api_key="test")
+    llm = FakeLLM(latency=0.01)
+    myomyo.llm = llm
+
+    async def play(game_id: str, turn: int):
+        # 같은 게임의 요청도 약간씩 늦게 도착하도록 하여 인터리빙 유도
+        await asyncio.sleep(turn * 0.001)
+        return await myomyo.generate_response(game_id=game_id, prompt=f"{game_id}#{turn}")
+
+    async def run():
+        requests = [(game_id, t) for game_id in game_ids for t in range(turns)]
+        random.shuffle(requests)
+        # 순서 검증을 위해 압축/요약이 일어나지 않도록 충분한 예산 사용
+        for game_id in game_ids:
+            myomyo._ensure_game_exists(game_id).token_budget = 10 ** 9
+        await asyncio.gather(*(play(game_id, turn) for game_id, turn in requests))
+
+    asyncio.run(run())
+
+    # 같은 게임의 턴은 한 번에 하나씩, 다른 게임끼리는 동시에 실행됨
+    assert all(llm.max_per_game[game_id] == 1 for game_id in game_ids)
+    assert llm.max_total > 1
+
+    # 같은 게임의 턴은 도착 순서대로 (프롬프트 → 응답) 쌍으로 기록됨
+    for game_id in game_ids:
+        logged = [m["content"] for m in myomyo.game_histories[game_id].turns]
+        expected = [f"{game_id}#{t}" for t in range(turns)]
+        assert logged[0::2] == expected
+        assert logged[1::2] == ["echo:" + prompt for prompt in expected]
@@ -0,0 +1,26 @@
+import asyncio
+
+from src.chat.task_pool import TaskPool
+
+
+def test_refill_stops_when_producer_only_returns_duplicates():
+    calls = 0
+
+    async def producer(exclude):
+        nonlocal calls
+        calls += 1
+        return {'keyword': '고양이', 'situation': '낮잠 자는 고양이'}
+
+    async def run():
+        pool = TaskPool(producer, lambda: ['고양이'], size=5, low_water=2, refill_concurrency=2)
+        pool.refill()
+        await asyncio.wait_for(pool._refill_task, timeout=1)
+        return pool
+
+    pool = asyncio.run(run())
+
+    assert calls == 2  # 한 번의 동시 생성 후 추가된 과제가 없어 중단
+    stats = pool.stats()
+    assert stats['depth'] == 0
+    assert stats['discarded'] == 2
+    assert not stats['refilling']
@@ -0,0 +1,23 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+from PIL import Image
+
+from src.image.text_masking import paint_boxes
+
+
+def test_paint_boxes_fills_overlapping_boxes():
+    image = Image.new('RGB', (20, 20), 'black')
+    boxes = [
+        [[2, 2], [10, 2], [10, 10], [2, 10]],
+        [[6, 6], [14, 6], [14, 14], [6, 14]],
+    ]
+
+    masked = np.asarray(paint_boxes(image, boxes))
+
+    assert (masked[8, 8] == 255).all()  # 두 박스가 겹친 영역
+    assert (masked[3, 3] == 255).all()
+    assert (masked[13, 13] == 255).all()
+    assert (masked[18, 18] == 0).all()